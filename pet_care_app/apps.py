@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PetCareAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pet_care_app'
+
+    def ready(self):
+        from . import profiling, signals  # noqa: F401
@@ -0,0 +1,365 @@
+import hashlib
+from datetime import MAXYEAR, date, datetime, time, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import classonlymethod
+from django.utils.http import http_date
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from .models import *
+from .serializers import *
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+
+from .authentication import ClaimsJWTAuthentication
+from .catalog import PARTNER_ORDERINGS, get_partner_catalog
+from .exports import EXPORT_CONTENT_TYPES, EXPORT_KINDS, aiter_history, history_sources, iter_history
+from .fast_serializers import calendar_event_values, journal_entry_values, pet_values
+from .pagination import KeysetPaginator
+from .recurrence import dates_in_window
+from .responses import EnvelopeResponse, FastJsonResponse
+from .search import highlight, search_forum, search_journal
+from .timeline import TIMELINE_KINDS, TIMELINE_ORDERING, parse_timeline_cursor, timeline_item, timeline_querysets
+from .views import (CalendarEventListCreateView, ForumCommentView, ForumPostView, JournalEntryListCreateView,
+                    PetListCreateView)
+
+
+class AsyncReadView(View):
+    # GET обслуговується напряму через async ORM (read() підкласу), без потоку на запит;
+    # методи з write_methods делегуються синхронному DRF-view (write_view); без write_view їх
+    # немає зовсім, тож OPTIONS і Allow не обіцяють запису, а сам запит отримує звичайний 405
+    write_view = None
+    write_methods = ('post',)
+    allow_anonymous = False
+    versioned_collection = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.write_view is not None:
+            for method in cls.write_methods:
+                setattr(cls, method, cls._write)
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        if cls.write_view is not None:
+            cls._write_handler = staticmethod(cls.write_view.as_view())
+        return csrf_exempt(view)
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            result = ClaimsJWTAuthentication().authenticate(request)
+        except AuthenticationFailed as exc:
+            return self._unauthorized(exc.detail)
+        request.user = result[0] if result else AnonymousUser()
+        if not request.user.is_authenticated and not self.allow_anonymous:
+            return self._unauthorized({'detail': 'Authentication credentials were not provided.'})
+        etag = None
+        if self.versioned_collection and request.user.is_authenticated:
+            # 304 коштує один запит до версії колекції, без основного запиту і серіалізації
+            etag = await self.collection_etag(request)
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return not_modified
+        try:
+            response = await self.read(request, *args, **kwargs)
+        except ValidationError as exc:
+            return FastJsonResponse(exc.detail, status=status.HTTP_400_BAD_REQUEST, safe=False)
+        if etag and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    async def collection_etag(self, request):
+        version = await CollectionVersion.aget_version(request.user.id, self.versioned_collection)
+        query = hashlib.sha1(self.etag_key(request).encode()).hexdigest()[:12]
+        return f'"{self.versioned_collection}-{request.user.id}-{version}-{query}"'
+
+    def etag_key(self, request):
+        return request.GET.urlencode()
+
+    async def _write(self, request, *args, **kwargs):
+        return await sync_to_async(self._write_handler)(request, *args, **kwargs)
+
+    def _unauthorized(self, detail):
+        response = FastJsonResponse(detail, status=status.HTTP_401_UNAUTHORIZED)
+        response['WWW-Authenticate'] = 'Bearer realm="api"'
+        return response
+
+
+class PetListView(AsyncReadView):
+    query_budget = {'GET': 2}
+    write_view = PetListCreateView
+    versioned_collection = 'pets'
+
+    async def read(self, request):
+        pets = Pet.objects.filter(user_id=request.user.id).values(*pet_values.columns)
+        return EnvelopeResponse("PetListDto", pet_values.many([pet async for pet in pets]), status=status.HTTP_200_OK)
+
+
+class CalendarEventListView(AsyncReadView):
+    query_budget = {'GET': 3}
+    write_view = CalendarEventListCreateView
+    versioned_collection = 'calendar'
+
+    def etag_key(self, request):
+        # без year/month показується поточний місяць - він теж входить у ETag
+        return f'{request.GET.urlencode()}&now={timezone.now():%Y-%m}'
+
+    async def read(self, request):
+        params = request.GET
+        now = timezone.now()
+        year = _parse(params, 'year', int) if 'year' in params else now.year
+        month = _parse(params, 'month', int) if 'month' in params else now.month
+        if not 1 <= month <= 12:
+            raise ValidationError({'month': 'Must be between 1 and 12.'})
+        if not 1 <= year < MAXYEAR:
+            raise ValidationError({'year': f'Must be between 1 and {MAXYEAR - 1}.'})
+        pet_id = _parse(params, 'pet', int) if params.get('pet') else None
+        start, end = month_bounds(year, month)
+        events = CalendarEvent.objects.for_month(request.user, year, month, pet_id)
+        rows = [row async for row in events.values(*calendar_event_values.columns)]
+        recurring = [row['id'] for row in rows if row['recurrence__pk'] is not None]
+        overrides = {}
+        if recurring:
+            overrides = {
+                (event_id, day): completed async for event_id, day, completed in
+                EventOccurrenceOverride.objects.filter(
+                    event_id__in=recurring, occurrence_date__gte=start, occurrence_date__lt=end
+                ).values_list('event_id', 'occurrence_date', 'completed')
+            }
+
+        # повторювані події розгортаються лише в межах запитаного місяця
+        payload = []
+        for row in rows:
+            data = calendar_event_values.to_representation(row)
+            if row['recurrence__pk'] is None:
+                days = [(row['start_date'], row['completed'])]
+            else:
+                days = [(day, overrides.get((row['id'], day), False)) for day in dates_in_window(
+                    row['start_date'], row['recurrence__freq'], row['recurrence__interval'],
+                    row['recurrence__ends_on'], row['recurrence__exdates'], start, end
+                )]
+            for day, completed in days:
+                occurrence = {**data, 'start_date': day.isoformat(), 'completed': completed}
+                if data['recurrence']:
+                    occurrence['series_start_date'] = data['start_date']
+                payload.append(occurrence)
+        payload.sort(key=lambda item: (item['start_date'], item['start_time'] or ''))
+        return EnvelopeResponse('CalendarListDto', payload)
+
+
+class JournalEntryListView(AsyncReadView):
+    query_budget = {'GET': 2}
+    write_view = JournalEntryListCreateView
+    versioned_collection = 'journal'
+    paginator = KeysetPaginator(
+        ordering=('-created_at', '-id'),
+        page_size=settings.JOURNAL_PAGE_SIZE,
+        max_page_size=settings.JOURNAL_MAX_PAGE_SIZE,
+    )
+
+    async def read(self, request):
+        entries = JournalEntry.objects.filter(pet__user_id=request.user.id)
+        params = request.GET
+        if params.get('entry_type'):
+            if params['entry_type'] not in dict(TYPE_CHOICES):
+                raise ValidationError({'entry_type': 'Unknown entry type.'})
+            entries = entries.filter(entry_type=params['entry_type'])
+        if params.get('pet'):
+            entries = entries.filter(pet_id=_parse(params, 'pet', int))
+        # [from, to] включно, як діапазон дат у календарі клієнта
+        if params.get('from'):
+            entries = entries.filter(created_at__gte=_start_of_day(_parse(params, 'from', date.fromisoformat)))
+        if params.get('to'):
+            day_after = _parse(params, 'to', lambda value: date.fromisoformat(value) + timedelta(days=1))
+            entries = entries.filter(created_at__lt=_start_of_day(day_after))
+        entries = search_journal(entries, params.get('q', ''))
+
+        entries, next_cursor = await self.paginator.apaginate(entries.values(*journal_entry_values.columns), params)
+        return EnvelopeResponse('JournalListDto', journal_entry_values.many(entries), next=next_cursor)
+
+
+class ForumSearchView(AsyncReadView):
+    query_budget = {'GET': 1}
+    allow_anonymous = True
+    scopes = {
+        'posts': (ForumPost, 'post_text'),
+        'comments': (ForumComment, 'comment_text'),
+    }
+    paginator = KeysetPaginator(
+        ordering=('-rank', '-id'),
+        page_size=settings.FORUM_SEARCH_PAGE_SIZE,
+        max_page_size=settings.FORUM_SEARCH_MAX_PAGE_SIZE,
+    )
+
+    async def read(self, request):
+        # коротші за триграму слова не можуть використати індекс, тож відкидаються, а не шукаються
+        # повним переглядом таблиці; FORUM_SEARCH_MIN_QUERY діє на кожне слово
+        words = [word for word in request.GET.get('q', '').split() if len(word) >= settings.FORUM_SEARCH_MIN_QUERY]
+        if not words:
+            raise ValidationError({'q': f'Use at least one word of {settings.FORUM_SEARCH_MIN_QUERY} characters.'})
+        text = ' '.join(words)
+        scope = request.GET.get('scope', 'posts')
+        if scope not in self.scopes:
+            raise ValidationError({'scope': 'Must be posts or comments.'})
+        model, field = self.scopes[scope]
+
+        queryset = search_forum(model.objects.select_related('user'), field, text)
+        rows, next_cursor = await self.paginator.apaginate(queryset, request.GET)
+        return FastJsonResponse({'next': next_cursor, 'results': [{
+            'id': row.id,
+            'post_id': row.forum_post_id if scope == 'comments' else row.id,
+            'user_full': row.user.full_name,
+            'created_at': row.created_at,
+            'rank': row.rank,
+            'snippet': highlight(getattr(row, field), text),
+        } for row in rows]})
+
+
+class PetTimelineView(AsyncReadView):
+    # Журнал і календар улюбленця однією стрічкою (новіші спершу): ?kind=journal|calendar&type=...
+    query_budget = {'GET': 2}
+    paginator = KeysetPaginator(
+        ordering=TIMELINE_ORDERING,
+        page_size=settings.TIMELINE_PAGE_SIZE,
+        max_page_size=settings.TIMELINE_MAX_PAGE_SIZE,
+    )
+
+    async def read(self, request, pk):
+        params = request.GET
+        kinds = params.getlist('kind') or TIMELINE_KINDS
+        if any(kind not in TIMELINE_KINDS for kind in kinds):
+            raise ValidationError({'kind': f'Must be one of {", ".join(TIMELINE_KINDS)}.'})
+        item_type = params.get('type')
+        if item_type and item_type not in dict(TYPE_CHOICES):
+            raise ValidationError({'type': 'Unknown type.'})
+        cursor = None
+        if params.get('cursor'):
+            cursor = parse_timeline_cursor(self.paginator.decode_cursor(params['cursor']))
+            if cursor is None:
+                raise ValidationError({'cursor': 'Invalid cursor.'})
+        if not await Pet.objects.filter(pk=pk, user_id=request.user.id).aexists():
+            return FastJsonResponse({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        rows, next_cursor = await self.paginator.apaginate_union(
+            timeline_querysets(pk, kinds, item_type, cursor), params
+        )
+        return EnvelopeResponse('TimelineDto', [timeline_item(row) for row in rows], next=next_cursor)
+
+
+class HistoryExportView(AsyncReadView):
+    # Повна історія (журнал + календар) потоком NDJSON/CSV: ?format=ndjson|csv&kind=journal|calendar
+    query_budget = {'GET': 1}
+
+    async def read(self, request, pk=None):
+        export_format = request.GET.get('format', 'ndjson')
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise ValidationError({'format': f'Must be one of {", ".join(EXPORT_CONTENT_TYPES)}.'})
+        kinds = request.GET.getlist('kind') or EXPORT_KINDS
+        if any(kind not in EXPORT_KINDS for kind in kinds):
+            raise ValidationError({'kind': f'Must be one of {", ".join(EXPORT_KINDS)}.'})
+        if pk is not None and not await Pet.objects.filter(pk=pk, user_id=request.user.id).aexists():
+            return FastJsonResponse({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        sources = history_sources(request.user.id, pk, kinds)
+        # Під ASGI - async-генератор; під WSGI Django зібрав би його в пам'ять, тому звичайний ітератор
+        if isinstance(request, ASGIRequest):
+            content = aiter_history(sources, export_format)
+        else:
+            content = iter_history(sources, export_format)
+        response = StreamingHttpResponse(content, content_type=EXPORT_CONTENT_TYPES[export_format])
+        filename = f'pet-{pk}-history' if pk is not None else 'history'
+        response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+def _parse(params, name, parser):
+    try:
+        return parser(params[name])
+    except (ValueError, OverflowError):
+        raise ValidationError({name: 'Invalid value.'})
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class SitePartnerListView(AsyncReadView):
+    query_budget = {'GET': 1}
+
+    async def read(self, request):
+        partner_type = request.GET.get('partner_type')
+        ordering = request.GET.get('ordering')
+        if partner_type is not None and partner_type not in dict(PARTNER_TYPES):
+            raise ValidationError({'partner_type': f'Must be one of {", ".join(dict(PARTNER_TYPES))}.'})
+        if ordering not in PARTNER_ORDERINGS:
+            raise ValidationError({'ordering': 'Must be rating or -rating.'})
+
+        catalog, last_modified = await get_partner_catalog(partner_type, ordering)
+        response = get_conditional_response(request, etag=catalog['etag'], last_modified=last_modified)
+        if response is None:
+            response = HttpResponse(catalog['body'], content_type='application/json')
+        response['ETag'] = catalog['etag']
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class PartnerWatchlistListView(AsyncReadView):
+    query_budget = {'GET': 2}
+
+    async def read(self, request):
+        partner_ids = PartnerWatchlist.objects.filter(
+            user_id=request.user.id
+        ).values_list('partner_id', flat=True)
+        return EnvelopeResponse(
+            "PartnerWatchlistListDto", [partner_id async for partner_id in partner_ids], status=status.HTTP_200_OK
+        )
+
+
+class ForumFeedView(AsyncReadView):
+    query_budget = {'GET': 3}
+    write_view = ForumPostView
+    allow_anonymous = True
+    paginator = KeysetPaginator(
+        ordering=('-created_at', '-id'),
+        page_size=settings.FORUM_FEED_PAGE_SIZE,
+        max_page_size=settings.FORUM_FEED_MAX_PAGE_SIZE,
+    )
+
+    async def read(self, request):
+        posts, next_cursor = await self.paginator.apaginate(
+            ForumPost.objects.for_feed(request.user, settings.FORUM_FEED_COMMENT_PREVIEW),
+            request.GET
+        )
+        serializer = ForumPostSerializer(
+            posts, many=True, context={'request': request}
+        )
+        return FastJsonResponse({'next': next_cursor, 'results': serializer.data})
+
+
+class ForumCommentListView(AsyncReadView):
+    query_budget = {'GET': 1}
+    write_view = ForumCommentView
+    allow_anonymous = True
+    paginator = KeysetPaginator(
+        ordering=('created_at', 'id'),
+        page_size=settings.FORUM_COMMENTS_PAGE_SIZE,
+        max_page_size=settings.FORUM_COMMENTS_MAX_PAGE_SIZE,
+    )
+
+    async def read(self, request, post_id):
+        comments, next_cursor = await self.paginator.apaginate(
+            ForumComment.objects.filter(forum_post_id=post_id).select_related('user'),
+            request.GET
+        )
+        serializer = ForumCommentSerializer(comments, many=True)
+        return FastJsonResponse({'next': next_cursor, 'results': serializer.data})
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+
+class ClaimsUser:
+    # Користувач, зібраний лише з перевірених claims токена, без запиту до Users
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+    is_staff = False
+    is_superuser = False
+
+    def __init__(self, token):
+        self.id = self.pk = token[api_settings.USER_ID_CLAIM]
+        subject = token.get('sub')
+        self.full_name = subject.get('fullname') if isinstance(subject, dict) else None
+
+    def __str__(self):
+        return self.full_name or f'User #{self.id}'
+
+
+class UserCache:
+    # Обмежений LRU-кеш з TTL; зберігає значення полів, а не сам об'єкт,
+    # щоб кожен запит отримував власний екземпляр User
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._fields = [field.attname for field in User._meta.concrete_fields]
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        return User.from_db('default', self._fields, values)
+
+    def set(self, user):
+        values = tuple(getattr(user, name) for name in self._fields)
+        with self._lock:
+            self._entries[user.pk] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user.pk)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id) if user_id is not None else None
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user)
+        return user
+
+
+class ClaimsJWTAuthentication(CachedJWTAuthentication):
+    # Для GET/HEAD/OPTIONS request.user - ClaimsUser (лише id та full_name);
+    # для змінюючих запитів - повна модель User з кешу
+    def authenticate(self, request):
+        if request.method not in SAFE_METHODS:
+            return super().authenticate(request)
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return ClaimsUser(validated_token), validated_token
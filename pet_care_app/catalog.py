@@ -0,0 +1,48 @@
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import SitePartner
+from .responses import dumps
+from .fast_serializers import site_partner_values
+
+CATALOG_VERSION_KEY = 'partners:catalog:version'
+
+PARTNER_ORDERINGS = {
+    None: ('id',),
+    'rating': ('rating', 'id'),
+    '-rating': ('-rating', '-id'),
+}
+
+
+def _new_version():
+    return {'version': uuid.uuid4().hex, 'last_modified': int(time.time())}
+
+
+def invalidate_partner_catalog():
+    # Нова версія робить недійсними всі варіанти каталогу (тип x сортування) одним записом
+    cache.set(CATALOG_VERSION_KEY, _new_version(), settings.PARTNER_CATALOG_CACHE_TTL)
+
+
+async def get_partner_catalog(partner_type=None, ordering=None):
+    # Повертає ({'body', 'etag'}, last_modified); з теплим кешем — без запитів до БД
+    meta = await cache.aget(CATALOG_VERSION_KEY)
+    if meta is None:
+        version = _new_version()
+        await cache.aadd(CATALOG_VERSION_KEY, version, settings.PARTNER_CATALOG_CACHE_TTL)
+        # зазвичай - версія, яку першим додав паралельний запит; None дає DummyCache або витіснення
+        meta = await cache.aget(CATALOG_VERSION_KEY) or version
+
+    key = f'partners:catalog:{meta["version"]}:{partner_type or "all"}:{ordering or "default"}'
+    entry = await cache.aget(key)
+    if entry is None:
+        partners = SitePartner.objects.order_by(*PARTNER_ORDERINGS[ordering])
+        if partner_type:
+            partners = partners.filter(partner_type=partner_type)
+        body = dumps(site_partner_values.many([row async for row in partners.values(*site_partner_values.columns)]))
+        entry = {'body': body, 'etag': f'"{hashlib.sha256(body).hexdigest()[:40]}"'}
+        await cache.aset(key, entry, settings.PARTNER_CATALOG_CACHE_TTL)
+    return entry, meta['last_modified']
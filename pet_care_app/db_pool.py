@@ -0,0 +1,61 @@
+import logging
+
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework import status
+
+from .responses import FastJsonResponse
+
+try:
+    from psycopg_pool import PoolTimeout
+except ImportError:
+    PoolTimeout = None
+
+logger = logging.getLogger(__name__)
+
+
+def pool_stats(alias='default'):
+    # Статистика пулу поточного процесу воркера; у кожного воркера свій пул
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return {'alias': alias, 'pooled': False}
+    stats = pool.get_stats()
+    return {
+        'alias': alias,
+        'pooled': True,
+        'min_size': stats.get('pool_min'),
+        'max_size': stats.get('pool_max'),
+        'size': stats.get('pool_size', 0),
+        'in_use': stats.get('pool_size', 0) - stats.get('pool_available', 0),
+        'available': stats.get('pool_available', 0),
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': stats.get('requests_num', 0),
+        'requests_queued': stats.get('requests_queued', 0),
+        'wait_ms_total': stats.get('requests_wait_ms', 0),
+        'timeouts': stats.get('requests_errors', 0),
+        'connections_opened': stats.get('connections_num', 0),
+        'connection_errors': stats.get('connections_errors', 0),
+    }
+
+
+def is_pool_timeout(exc):
+    while exc is not None and PoolTimeout is not None:
+        if isinstance(exc, PoolTimeout):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class PoolTimeoutMiddleware(MiddlewareMixin):
+    # Django загортає PoolTimeout в OperationalError; віддаємо 503 замість 500
+
+    def process_exception(self, request, exception):
+        if not is_pool_timeout(exception):
+            return None
+        logger.warning('Database connection pool exhausted: %s', pool_stats())
+        response = FastJsonResponse(
+            {'detail': 'Database is busy, please retry.'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        response['Retry-After'] = '1'
+        return response
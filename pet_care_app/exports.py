@@ -0,0 +1,85 @@
+import csv
+
+from django.conf import settings
+
+from .fast_serializers import calendar_event_values, journal_entry_values
+from .models import CalendarEvent, JournalEntry
+from .responses import dumps
+
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+EXPORT_KINDS = ('journal', 'calendar')
+
+CSV_COLUMNS = ('kind', 'id', 'pet', 'type', 'title', 'date', 'time', 'description', 'completed', 'recurrence')
+# Такі клітинки Excel виконує як формулу (CSV injection)
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def history_sources(user_id, pet_id=None, kinds=EXPORT_KINDS):
+    # (kind, ValuesSerializer, queryset) у хронологічному порядку; рядки читаються через .values(),
+    # тож пам'ять воркера не залежить від кількості записів
+    sources = []
+    if 'journal' in kinds:
+        entries = JournalEntry.objects.filter(pet__user_id=user_id).order_by('created_at', 'id')
+        if pet_id is not None:
+            entries = entries.filter(pet_id=pet_id)
+        sources.append(('journal', journal_entry_values, entries.values(*journal_entry_values.columns)))
+    if 'calendar' in kinds:
+        # повторювані події експортуються як серія з правилом, без розгортання дат
+        events = CalendarEvent.objects.filter(pet__user_id=user_id).order_by('start_date', 'id')
+        if pet_id is not None:
+            events = events.filter(pet_id=pet_id)
+        sources.append(('calendar', calendar_event_values, events.values(*calendar_event_values.columns)))
+    return sources
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _csv_row(kind, data):
+    if kind == 'journal':
+        row = (data['entry_type'], data['entry_title'], data['created_at'], '', data['description'], '', '')
+    else:
+        recurrence = data['recurrence']
+        row = (data['event_type'], data['event_title'], data['start_date'], data['start_time'] or '',
+               data['description'], data['completed'], dumps(recurrence).decode() if recurrence else '')
+    return (kind, data['id'], data['pet']) + tuple(_csv_cell(value) for value in row)
+
+
+def _csv_cell(value):
+    # апостроф Excel показує лише як ознаку тексту
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def history_encoder(export_format):
+    # -> (заголовок, encode(kind, data)); кожен рядок кодується в bytes окремо
+    if export_format == 'ndjson':
+        return b'', lambda kind, data: dumps({'kind': kind, **data}) + b'\n'
+    writer = csv.writer(_Echo())
+    # BOM, щоб Excel відкривав кирилицю без майстра імпорту
+    header = '\ufeff'.encode() + writer.writerow(CSV_COLUMNS).encode()
+    return header, lambda kind, data: writer.writerow(_csv_row(kind, data)).encode()
+
+
+def iter_history(sources, export_format):
+    header, encode = history_encoder(export_format)
+    if header:
+        yield header
+    for kind, fast, rows in sources:
+        for row in rows.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+            yield encode(kind, fast.to_representation(row))
+
+
+async def aiter_history(sources, export_format):
+    header, encode = history_encoder(export_format)
+    if header:
+        yield header
+    for kind, fast, rows in sources:
+        async for row in rows.aiterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+            yield encode(kind, fast.to_representation(row))
@@ -0,0 +1,92 @@
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+
+from .profiling import span
+from .serializers import CalendarEventSerializer, JournalEntrySerializer, PetSerializer, SitePartnerSerializer
+
+# Поля, чий to_representation для значень із .values() повертає їх без змін
+_IDENTITY_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField, serializers.JSONField,
+    serializers.ReadOnlyField, PrimaryKeyRelatedField,
+)
+
+
+def _iso(value):
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def _converter(field):
+    if type(field) is serializers.ChoiceField or isinstance(field, _IDENTITY_FIELDS):
+        return None
+    if isinstance(field, serializers.DateTimeField):
+        if getattr(field, 'format', api_settings.DATETIME_FORMAT).lower() != 'iso-8601':
+            return field.to_representation
+        enforce_timezone = field.enforce_timezone
+
+        def datetime_iso(value):
+            value = enforce_timezone(value).isoformat()
+            return value[:-6] + 'Z' if value.endswith('+00:00') else value
+        return datetime_iso
+    if isinstance(field, serializers.DateField):
+        setting = api_settings.DATE_FORMAT
+    elif isinstance(field, serializers.TimeField):
+        setting = api_settings.TIME_FORMAT
+    else:
+        return field.to_representation
+    return _iso if getattr(field, 'format', setting).lower() == 'iso-8601' else field.to_representation
+
+
+class ValuesSerializer:
+    # Read-only шлях для списків: поля DRF-серіалізатора один раз компілюються в
+    # (колонка .values(), конвертер), а рядки перетворюються на dict без ModelSerializer.
+    # Вивід збігається з serializer_class(many=True).data (див. тест на паритет).
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.columns = []
+        self._plan = self._compile(serializer_class(), '')
+
+    def _compile(self, serializer, prefix):
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            unsupported = (serializers.SerializerMethodField, serializers.ListSerializer)
+            if field.source == '*' or isinstance(field, unsupported):
+                raise TypeError(f'{type(serializer).__name__}.{name} cannot be read from .values()')
+            column = prefix + field.source.replace('.', '__')
+            if isinstance(field, serializers.BaseSerializer):
+                # вкладений серіалізатор one-to-one: None, якщо пов'язаного рядка немає
+                presence = f'{column}__pk'
+                self.columns.append(presence)
+                plan.append((name, presence, self._compile(field, f'{column}__')))
+                continue
+            self.columns.append(column)
+            plan.append((name, column, _converter(field)))
+        return plan
+
+    def _represent(self, plan, row):
+        data = {}
+        for name, column, convert in plan:
+            value = row[column]
+            if value is None:
+                data[name] = None
+            elif isinstance(convert, list):
+                data[name] = self._represent(convert, row)
+            else:
+                data[name] = value if convert is None else convert(value)
+        return data
+
+    def to_representation(self, row):
+        return self._represent(self._plan, row)
+
+    def many(self, rows):
+        with span('serialize'):
+            return [self._represent(self._plan, row) for row in rows]
+
+
+pet_values = ValuesSerializer(PetSerializer)
+calendar_event_values = ValuesSerializer(CalendarEventSerializer)
+journal_entry_values = ValuesSerializer(JournalEntrySerializer)
+site_partner_values = ValuesSerializer(SitePartnerSerializer)
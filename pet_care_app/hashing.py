@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+
+class HashingBusy(Exception):
+    pass
+
+
+class PasswordHashingExecutor:
+    # Окремий обмежений пул для bcrypt/PBKDF2: хешування не блокує потоки, що
+    # обслуговують інші запити, а черга понад ліміт відхиляється одразу
+    def __init__(self, workers, queue_limit):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    async def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # слот звільняється і тоді, коли запит скасовано (клієнт відключився), поки задача ще в черзі
+        future.add_done_callback(lambda _future: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    async def make_password(self, password):
+        return await self.run(make_password, password)
+
+    async def verify_password(self, password, encoded):
+        # Повертає (is_correct, new_encoded); new_encoded не None, якщо параметри
+        # хешера змінилися і пароль треба перехешувати
+        return await self.run(_verify_and_upgrade, password, encoded)
+
+
+def _verify_and_upgrade(password, encoded):
+    is_correct, must_update = verify_password(password, encoded)
+    if is_correct and must_update:
+        return True, make_password(password)
+    return is_correct, None
+
+
+_hashing = None
+_hashing_lock = threading.Lock()
+
+
+def get_password_hashing():
+    global _hashing
+    if _hashing is None:
+        with _hashing_lock:
+            if _hashing is None:
+                _hashing = PasswordHashingExecutor(
+                    settings.PASSWORD_HASHING_WORKERS, settings.PASSWORD_HASHING_QUEUE_LIMIT
+                )
+    return _hashing
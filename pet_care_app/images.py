@@ -0,0 +1,41 @@
+from io import BytesIO
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+PHOTO_FORMATS = {
+    'WEBP': ('webp', 'image/webp'),
+    'JPEG': ('jpg', 'image/jpeg'),
+}
+
+
+def photo_format():
+    image_format = settings.MEDIA_PHOTO_FORMAT.upper()
+    extension, content_type = PHOTO_FORMATS[image_format]
+    return image_format, extension, content_type
+
+
+def build_photo_variants(file_obj):
+    # Повертає [(назва, BytesIO)] від найбільшого варіанта до найменшого.
+    # EXIF-орієнтація застосовується до пікселів, а самі метадані не зберігаються.
+    image_format, _, _ = photo_format()
+    variants = sorted(settings.MEDIA_PHOTO_VARIANTS.items(), key=lambda item: item[1], reverse=True)
+    largest = variants[0][1]
+
+    with Image.open(file_obj) as original:
+        # Для JPEG декодер одразу зменшує зображення в 2/4/8 разів - повний
+        # розмір багатомегапіксельного фото в пам'ять не потрапляє
+        original.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(original)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    result = []
+    for name, size in variants:
+        # Кожен наступний варіант зменшується з попереднього, а не з оригіналу
+        image.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        buffer = BytesIO()
+        image.save(buffer, image_format, quality=settings.MEDIA_PHOTO_QUALITY, optimize=True)
+        buffer.seek(0)
+        result.append((name, buffer))
+    return result
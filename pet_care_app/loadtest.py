@@ -0,0 +1,143 @@
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+SERVERS = {
+    'wsgi-sync': ['pet_care_service.wsgi:application', '--worker-class', 'sync'],
+    'asgi-uvicorn': ['pet_care_service.asgi:application', '--worker-class', 'uvicorn_worker.UvicornWorker'],
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, errors, duration):
+    return {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'throughput_rps': round((len(latencies) + errors) / duration, 1),
+        'p50_ms': _ms(percentile(latencies, 0.50)),
+        'p95_ms': _ms(percentile(latencies, 0.95)),
+        'p99_ms': _ms(percentile(latencies, 0.99)),
+        'mean_ms': _ms(statistics.fmean(latencies) if latencies else None),
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def run_load(base_url, targets, headers=None, concurrency=16, duration=10.0, timeout=30.0):
+    # targets: [(name, path)] або [(name, path, method, json_body)]; кожен потік тримає власне
+    # keep-alive з'єднання і по колу надсилає запити на всі цілі до закінчення duration.
+    # Повертає {name: summary, 'total': summary}
+    targets = [tuple(target) + ('GET', None)[len(target) - 2:] for target in targets]
+    url = urlsplit(base_url)
+    connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+    prefix = url.path.rstrip('/')
+    headers = dict(headers or {})
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(offset):
+        connection = connection_class(url.hostname, url.port, timeout=timeout)
+        local_latencies = defaultdict(list)
+        local_errors = defaultdict(int)
+        index = offset
+        while time.perf_counter() < deadline:
+            name, path, method, body = targets[index % len(targets)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                if body is None:
+                    connection.request(method, prefix + path, headers=headers)
+                else:
+                    connection.request(method, prefix + path, body=body,
+                                       headers={**headers, 'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                ok = response.status < 400
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = connection_class(url.hostname, url.port, timeout=timeout)
+                ok = False
+            if ok:
+                local_latencies[name].append(time.perf_counter() - started)
+            else:
+                local_errors[name] += 1
+        connection.close()
+        with lock:
+            for name, values in local_latencies.items():
+                latencies[name].extend(values)
+            for name, count in local_errors.items():
+                errors[name] += count
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    report = {name: summarize(latencies[name], errors[name], elapsed) for name, *_ in targets}
+    report['total'] = summarize(
+        [value for values in latencies.values() for value in values], sum(errors.values()), elapsed
+    )
+    return report
+
+
+def wait_until_ready(base_url, path='/', timeout=30.0):
+    url = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection(url.hostname, url.port, timeout=2)
+            connection.request('GET', path)
+            connection.getresponse().read()
+            connection.close()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(server_args, workers, ready_path='/', env=None):
+    # Запускає проєкт під gunicorn на вільному порту; yield - базовий URL
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    process = subprocess.Popen([
+        sys.executable, '-m', 'gunicorn', *server_args,
+        '--workers', str(workers),
+        '--bind', f'127.0.0.1:{port}',
+        '--log-level', 'warning',
+    ], env={**os.environ, **(env or {})})
+    try:
+        if not wait_until_ready(base_url, ready_path):
+            raise RuntimeError(f'Server {server_args[0]} did not start.')
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
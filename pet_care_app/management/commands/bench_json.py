@@ -0,0 +1,79 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from pet_care_app import responses
+from pet_care_app.models import JournalEntry, SitePartner
+from pet_care_app.serializers import JournalEntrySerializer, SitePartnerSerializer
+
+
+def _journal(rows):
+    now = timezone.now()
+    entries = [
+        JournalEntry(id=i, pet_id=i % 7 + 1, entry_type='TRAINING', entry_title=f'Прогулянка {i}',
+                     description='Довга прогулянка в парку, гра з м\'ячем і нові друзі. ' * 3,
+                     created_at=now - timedelta(minutes=i))
+        for i in range(rows)
+    ]
+    return {'payloadType': 'JournalListDto', 'payload': JournalEntrySerializer(entries, many=True).data}
+
+
+def _partners(rows):
+    partners = [
+        SitePartner(id=i, site_name=f'Partner {i}', site_url=f'https://partner{i}.example.com',
+                    partner_type='CLINIC', rating=Decimal('4.5'), photo_url=None)
+        for i in range(rows)
+    ]
+    return SitePartnerSerializer(partners, many=True).data
+
+
+ENCODERS = {
+    'stdlib': lambda data: json.dumps(data, cls=DjangoJSONEncoder).encode(),
+    'envelope': responses.dumps,
+}
+
+
+class Command(BaseCommand):
+    help = ('Compares encode time and size of the stdlib JSON encoder (what JsonResponse uses) with the '
+            'envelope encoder from pet_care_app.responses on realistic serializer output.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+        parser.add_argument('--rounds', type=int, default=20, help='Timed encodes per encoder and payload.')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable JSON instead of a table.')
+
+    def handle(self, *args, **options):
+        results = []
+        for rows in options['rows']:
+            for name, build in (('journal', _journal), ('partners', _partners)):
+                data = build(rows)
+                for encoder, encode in ENCODERS.items():
+                    times = []
+                    for _ in range(options['rounds']):
+                        started = time.perf_counter()
+                        body = encode(data)
+                        times.append(time.perf_counter() - started)
+                    results.append({
+                        'payload': name,
+                        'rows': rows,
+                        'encoder': encoder if encoder == 'stdlib' or responses.orjson is None else 'orjson',
+                        'encode_ms_median': round(statistics.median(times) * 1000, 2),
+                        'encode_ms_max': round(max(times) * 1000, 2),
+                        'bytes': len(body),
+                    })
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'{"payload":<10}{"rows":>7}  {"encoder":<8}{"ms (p50/max)":>20}{"bytes":>12}')
+        for row in results:
+            self.stdout.write(
+                f'{row["payload"]:<10}{row["rows"]:>7}  {row["encoder"]:<8}'
+                f'{row["encode_ms_median"]:>11} / {row["encode_ms_max"]:<6}{row["bytes"]:>12}'
+            )
@@ -0,0 +1,47 @@
+import json
+import statistics
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Measures encode/verify cost of every hasher in PASSWORD_HASHERS on this machine.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=10, help='Timed encode/verify calls per hasher.')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable JSON instead of a table.')
+
+    def handle(self, *args, **options):
+        password = 'correct horse battery staple'
+        results = []
+        for hasher in get_hashers():
+            encode_times = []
+            verify_times = []
+            for _ in range(options['rounds']):
+                started = time.perf_counter()
+                encoded = hasher.encode(password, hasher.salt())
+                encode_times.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                hasher.verify(password, encoded)
+                verify_times.append(time.perf_counter() - started)
+            results.append({
+                'hasher': hasher.algorithm,
+                'parameters': {k: v for k, v in vars(type(hasher)).items() if k in ('iterations', 'rounds')},
+                'encode_ms_median': round(statistics.median(encode_times) * 1000, 2),
+                'encode_ms_max': round(max(encode_times) * 1000, 2),
+                'verify_ms_median': round(statistics.median(verify_times) * 1000, 2),
+                'verify_ms_max': round(max(verify_times) * 1000, 2),
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'{"hasher":<22}{"encode ms (p50/max)":>24}{"verify ms (p50/max)":>24}')
+        for row in results:
+            self.stdout.write(
+                f'{row["hasher"]:<22}'
+                f'{row["encode_ms_median"]:>15} / {row["encode_ms_max"]:<6}'
+                f'{row["verify_ms_median"]:>15} / {row["verify_ms_max"]:<6}'
+            )
@@ -0,0 +1,95 @@
+import json
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from pet_care_app.fast_serializers import (calendar_event_values, journal_entry_values, pet_values,
+                                           site_partner_values)
+from pet_care_app.models import CalendarEvent, JournalEntry, Pet, SitePartner, User
+from pet_care_app.serializers import (CalendarEventSerializer, JournalEntrySerializer, PetSerializer,
+                                      SitePartnerSerializer)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Seeds N rows per list endpoint inside a rolled-back transaction and compares DRF ModelSerializer '
+            'output with the .values() fast path (query + serialization).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--rounds', type=int, default=5)
+        parser.add_argument('--json', action='store_true', help='Print machine-readable JSON instead of a table.')
+
+    def handle(self, *args, **options):
+        results = []
+        try:
+            with transaction.atomic():
+                cases = self._seed(options['rows'])
+                for name, fast, serializer_class, queryset in cases:
+                    drf = self._time(options['rounds'], lambda: serializer_class(queryset.all(), many=True).data)
+                    values = self._time(options['rounds'], lambda: fast.many(queryset.values(*fast.columns)))
+                    results.append({
+                        'serializer': name,
+                        'rows': options['rows'],
+                        'drf_ms_median': drf,
+                        'values_ms_median': values,
+                        'speedup': round(drf / values, 1) if values else None,
+                    })
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'{"serializer":<26}{"rows":>7}{"drf ms":>10}{"values ms":>11}{"speedup":>9}')
+        for row in results:
+            self.stdout.write(
+                f'{row["serializer"]:<26}{row["rows"]:>7}{row["drf_ms_median"]:>10}'
+                f'{row["values_ms_median"]:>11}{row["speedup"]:>8}x'
+            )
+
+    def _time(self, rounds, build):
+        times = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            build()
+            times.append(time.perf_counter() - started)
+        return round(statistics.median(times) * 1000, 2)
+
+    def _seed(self, rows):
+        user = User.objects.create_user(email='bench-serializers@example.com', password=None, full_name='Bench')
+        pets = Pet.objects.bulk_create([
+            Pet(user=user, pet_name=f'Pet {i}', breed='Mixed', birthday=date(2020, 1, 1),
+                photo_url=f'https://cdn.example/{i}.webp',
+                photo_variants={'thumbnail': f'https://cdn.example/{i}_t.webp'})
+            for i in range(rows)
+        ], batch_size=1000)
+        CalendarEvent.objects.bulk_create([
+            CalendarEvent(pet=pets[i % len(pets)], event_title=f'Event {i}',
+                          start_date=date(2025, 1, 1) + timedelta(i % 365), description='Vaccination reminder')
+            for i in range(rows)
+        ], batch_size=1000)
+        JournalEntry.objects.bulk_create([
+            JournalEntry(pet=pets[i % len(pets)], entry_title=f'Entry {i}', description='Walk in the park ' * 5)
+            for i in range(rows)
+        ], batch_size=1000)
+        SitePartner.objects.bulk_create([
+            SitePartner(site_name=f'Partner {i}', site_url=f'https://partner{i}.example', rating=Decimal('4.5'))
+            for i in range(rows)
+        ], batch_size=1000)
+        return [
+            ('PetSerializer', pet_values, PetSerializer, Pet.objects.filter(user=user)),
+            ('CalendarEventSerializer', calendar_event_values, CalendarEventSerializer,
+             CalendarEvent.objects.filter(pet__user=user).select_related('recurrence')),
+            ('JournalEntrySerializer', journal_entry_values, JournalEntrySerializer,
+             JournalEntry.objects.filter(pet__user=user)),
+            ('SitePartnerSerializer', site_partner_values, SitePartnerSerializer, SitePartner.objects.all()),
+        ]
@@ -0,0 +1,66 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from pet_care_app.loadtest import SERVERS, run_load, serve
+from pet_care_app.models import ForumPost, User
+from pet_care_app.views import MyRefreshToken
+
+
+class Command(BaseCommand):
+    help = ('Starts the project under gunicorn sync workers and under uvicorn (ASGI) workers with the same '
+            'worker count, drives the read endpoints with concurrent clients and prints throughput/latency as JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help='Email of the user whose token is used for the requests.')
+        parser.add_argument('--workers', type=int, default=2, help='Worker processes per server (= cores used).')
+        parser.add_argument('--concurrency', type=int, default=64, help='Concurrent client connections.')
+        parser.add_argument('--duration', type=float, default=15.0, help='Seconds of load per server.')
+        parser.add_argument('--servers', nargs='+', choices=sorted(SERVERS), default=sorted(SERVERS))
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User {options["user"]} does not exist.')
+        headers = {'Authorization': f'Bearer {MyRefreshToken.for_user(user).access_token}'}
+        targets = self._targets()
+
+        results = {
+            'config': {
+                'workers': options['workers'],
+                'concurrency': options['concurrency'],
+                'duration_s': options['duration'],
+                'database': settings.DATABASES['default']['ENGINE'],
+            },
+        }
+        for name in options['servers']:
+            self.stderr.write(f'Benchmarking {name}...')
+            results[name] = self._bench(SERVERS[name], targets, headers, options)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def _targets(self):
+        targets = [
+            ('pets', reverse('pets-list')),
+            ('calendar', reverse('calendar-list')),
+            ('journal', reverse('journal-list')),
+            ('partners', reverse('partners-list')),
+            ('watchlist', reverse('watchlist-list')),
+            ('forum', reverse('forum-post-list')),
+        ]
+        post_id = ForumPost.objects.order_by('-comments_count').values_list('id', flat=True).first()
+        if post_id:
+            targets.append(('forum-comments', reverse('forum-comments', args=[post_id])))
+        return targets
+
+    def _bench(self, server_args, targets, headers, options):
+        try:
+            with serve(server_args, options['workers'], ready_path=targets[0][1]) as base_url:
+                return run_load(
+                    base_url, targets, headers=headers,
+                    concurrency=options['concurrency'], duration=options['duration'],
+                )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from pet_care_app.models import CollectionVersion, ForumPost, Pet, User
+from pet_care_app.uploads import PHOTO_FAILED, PHOTO_PENDING
+
+PHOTO_MODELS = (User, Pet, ForumPost)
+
+
+class Command(BaseCommand):
+    help = ('Marks photos stuck in PENDING as FAILED. Upload jobs live only in the worker process, so a restart '
+            'loses them; run this periodically (e.g. from cron) so clients can upload the photo again.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=settings.MEDIA_UPLOAD_STALE_MINUTES,
+                            help='Minutes a photo may stay PENDING before it is failed.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many photos are stale.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+        # рядки без photo_pending_since стали PENDING ще до появи цього поля
+        stale = Q(photo_status=PHOTO_PENDING) & (
+            Q(photo_pending_since__lt=cutoff) | Q(photo_pending_since__isnull=True)
+        )
+        for model in PHOTO_MODELS:
+            rows = model.objects.filter(stale)
+            if options['dry_run']:
+                self.stdout.write(f'{model.__name__}: {rows.count()} stale photos')
+                continue
+            owners = set(rows.values_list('user_id', flat=True)) if model is Pet else ()
+            expired = rows.update(photo_status=PHOTO_FAILED)
+            # статус фото входить у ETag списку тварин
+            for user_id in owners:
+                CollectionVersion.bump(user_id, 'pets')
+            self.stdout.write(self.style.SUCCESS(f'{model.__name__}: {expired} stale photos marked FAILED'))
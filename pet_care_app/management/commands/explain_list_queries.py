@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+
+from pet_care_app.async_views import (
+    ForumCommentListView, ForumFeedView, ForumSearchView, JournalEntryListView, PetTimelineView,
+)
+from pet_care_app.catalog import PARTNER_ORDERINGS
+from pet_care_app.fast_serializers import calendar_event_values, journal_entry_values, pet_values, site_partner_values
+from pet_care_app.models import *
+from pet_care_app.search import search_forum
+from pet_care_app.timeline import timeline_querysets
+
+
+class Command(BaseCommand):
+    help = 'Prints EXPLAIN plans of the queries behind every list endpoint, so index regressions are visible.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Email of the user whose data is explained (default: the user with most pets).')
+        parser.add_argument('--search', default='walk', help='Words for the forum search query (default: walk).')
+        parser.add_argument('--analyze', action='store_true', help='Run EXPLAIN ANALYZE (PostgreSQL only).')
+
+    def handle(self, *args, **options):
+        user = self._get_user(options['user'])
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('--analyze is only supported on PostgreSQL.')
+            explain_options = {'analyze': True, 'buffers': True}
+
+        for name, queryset in self._list_queries(user, options['search']):
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {name} =='))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write('')
+
+    def _get_user(self, email):
+        if email:
+            try:
+                return User.objects.get(email=email)
+            except User.DoesNotExist:
+                raise CommandError(f'User {email} does not exist.')
+        user = User.objects.annotate(pet_total=Count('pets')).order_by('-pet_total').first()
+        if user is None:
+            raise CommandError('The database has no users; seed it first.')
+        return user
+
+    def _list_queries(self, user, search):
+        # Запити будуються так само, як у view: ті самі фільтри, keyset-сортування і LIMIT першої сторінки
+        today = timezone.now()
+        busiest_post = ForumPost.objects.order_by('-comments_count').values_list('id', flat=True).first()
+        busiest_pet = user.pets.annotate(
+            items=Count('journal_entries', distinct=True) + Count('calendar_events', distinct=True)
+        ).order_by('-items').values_list('id', flat=True).first()
+        queries = [
+            ('pets', Pet.objects.filter(user_id=user.id).values(*pet_values.columns)),
+            ('calendar (current month)', CalendarEvent.objects.for_month(user, today.year, today.month)
+                .values(*calendar_event_values.columns)),
+            ('journal (first page)', JournalEntryListView.paginator.page_queryset(
+                JournalEntry.objects.filter(pet__user_id=user.id).values(*journal_entry_values.columns), {}
+            )[0]),
+            ('partners', SitePartner.objects.order_by(*PARTNER_ORDERINGS[None]).values(*site_partner_values.columns)),
+            ('watchlist', PartnerWatchlist.objects.filter(user_id=user.id).values_list('partner_id', flat=True)),
+            ('forum feed (first page)', ForumFeedView.paginator.page_queryset(
+                ForumPost.objects.for_feed(user, settings.FORUM_FEED_COMMENT_PREVIEW), {}
+            )[0]),
+            ('forum comments (busiest post)', ForumCommentListView.paginator.page_queryset(
+                ForumComment.objects.filter(forum_post_id=busiest_post).select_related('user'), {}
+            )[0]),
+        ]
+        for scope, (model, field) in ForumSearchView.scopes.items():
+            queries.append((f'forum search ({scope}, first page)', ForumSearchView.paginator.page_queryset(
+                search_forum(model.objects.select_related('user'), field, search), {}
+            )[0]))
+        if busiest_pet is not None:
+            queries.append(('pet timeline (busiest pet, first page)', PetTimelineView.paginator.page_union(
+                timeline_querysets(busiest_pet), {}
+            )[0]))
+        return queries
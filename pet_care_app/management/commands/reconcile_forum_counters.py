@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from pet_care_app.models import ForumComment, ForumLike, ForumPost
+
+COUNTERS = (
+    ('likes_count', ForumLike),
+    ('comments_count', ForumComment),
+)
+
+
+class Command(BaseCommand):
+    help = 'Recalculates likes_count and comments_count of forum posts that drifted from the real rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report how many posts have drifted counters.'
+        )
+
+    def handle(self, *args, **options):
+        for field, model in COUNTERS:
+            actual = Coalesce(Subquery(
+                model.objects.filter(forum_post=OuterRef('pk'))
+                .order_by().values('forum_post').annotate(total=Count('id')).values('total')
+            ), 0)
+            drifted = ForumPost.objects.exclude(**{field: actual})
+            if options['dry_run']:
+                self.stdout.write(f'{field}: {drifted.count()} posts drifted')
+                continue
+            with transaction.atomic():
+                fixed = drifted.update(**{field: actual})
+            self.stdout.write(self.style.SUCCESS(f'{field}: {fixed} posts reconciled'))
@@ -0,0 +1,172 @@
+import json
+import platform
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+
+from pet_care_app.loadtest import SERVERS, run_load, serve
+from pet_care_app.models import ForumPost, Pet, User
+from pet_care_app.views import MyRefreshToken
+
+# Маршрути, які бенчмарк свідомо не навантажує
+SKIPPED = {
+    'signup': 'creates a new account per request',
+    'pets-detail': 'PUT/DELETE would change or remove the sample pet',
+    'calendar-detail': 'PUT/DELETE would change or remove the sample event',
+    'journal-detail': 'PUT/DELETE would change or remove the sample entry',
+    'calendar-occurrence': 'PATCH/DELETE only; covered by calendar writes',
+    'watchlist-detail': 'POST/DELETE toggles the sample partner',
+    'forum-detail': 'DELETE only',
+    'token_refresh': 'needs the refresh cookie',
+    'logout': 'invalidates the refresh cookie',
+    'db-pool-stats': 'staff only',
+}
+
+
+class Command(BaseCommand):
+    help = ('Drives every route in pet_care_service/urls.py concurrently with the seed_perf_data user and prints '
+            'throughput and p50/p95/p99 latency per endpoint as JSON. Media storage is local, so it runs offline.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', default='perf0@example.com', help='Email of the seeded user to act as.')
+        parser.add_argument('--password', default='perf-password', help='Used by the signin target.')
+        parser.add_argument('--base-url', help='Benchmark an already running server instead of starting one.')
+        parser.add_argument('--server', choices=sorted(SERVERS), default='asgi-uvicorn')
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--duration', type=float, default=20.0)
+        parser.add_argument('--warmup', type=float, default=2.0, help='Seconds of unreported load first.')
+        parser.add_argument('--include-writes', action='store_true')
+        parser.add_argument('--output', help='Also write the JSON report to this file.')
+        parser.add_argument('--compare', help='Baseline report; endpoints whose p95 regressed are listed.')
+        parser.add_argument('--max-regression', type=float, default=0.25,
+                            help='Allowed relative p95 growth against --compare before the command fails.')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User {options["user"]} does not exist; run seed_perf_data first.')
+        headers = {'Authorization': f'Bearer {MyRefreshToken.for_user(user).access_token}'}
+        targets, skipped = self.targets(user, options)
+
+        if options['base_url']:
+            endpoints = self.load(options['base_url'], targets, headers, options)
+        else:
+            # локальне сховище замість S3: жоден запит бенчмарку не йде в мережу
+            env = {'MEDIA_STORAGE_BACKEND': 'pet_care_app.media_storage.LocalMediaStorage'}
+            try:
+                with serve(SERVERS[options['server']], options['workers'], targets[0][1], env) as base_url:
+                    endpoints = self.load(base_url, targets, headers, options)
+            except RuntimeError as exc:
+                raise CommandError(str(exc))
+
+        report = {
+            'config': {
+                'server': options['base_url'] or options['server'],
+                'workers': options['workers'],
+                'concurrency': options['concurrency'],
+                'duration_s': options['duration'],
+                'database': settings.DATABASES['default']['ENGINE'],
+                'python': platform.python_version(),
+                'started_at': timezone.now().isoformat(),
+            },
+            'endpoints': endpoints,
+            'skipped': skipped,
+        }
+        regressions = self.compare(report, options['compare'], options['max_regression'])
+        if regressions is not None:
+            report['regressions'] = regressions
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output)
+        self.stdout.write(output)
+        if regressions:
+            raise CommandError(f'p95 regressed on: {", ".join(sorted(regressions))}')
+
+    def load(self, base_url, targets, headers, options):
+        if options['warmup'] > 0:
+            run_load(base_url, targets, headers=headers, concurrency=options['concurrency'],
+                     duration=options['warmup'])
+        return run_load(base_url, targets, headers=headers, concurrency=options['concurrency'],
+                         duration=options['duration'])
+
+    def targets(self, user, options):
+        # -> ([(name, path[, method, body])], {route: причина пропуску}); кожен іменований маршрут
+        # або навантажується, або явно пропущений - нові маршрути не випадають з бенчмарку мовчки
+        pet = Pet.objects.filter(user=user).order_by('id').first()
+        post = ForumPost.objects.order_by('-comments_count', 'id').first()
+        if pet is None or post is None:
+            raise CommandError('The user has no pets or there are no forum posts; run seed_perf_data first.')
+        today = timezone.localdate()
+        reads = {
+            'pets-list': [('pets-list', reverse('pets-list'))],
+            'pets-timeline': [('pets-timeline', reverse('pets-timeline', args=[pet.id]))],
+            'pets-export': [('pets-export', reverse('pets-export', args=[pet.id]))],
+            'profile': [('profile', reverse('profile'))],
+            'profile-export': [('profile-export', reverse('profile-export') + '?kind=calendar')],
+            'calendar-list': [('calendar-list', reverse('calendar-list'))],
+            'journal-list': [
+                ('journal-list', reverse('journal-list')),
+                ('journal-search', reverse('journal-list') + '?q=walk+vet'),
+            ],
+            'partners-list': [('partners-list', reverse('partners-list') + '?ordering=-rating')],
+            'watchlist-list': [('watchlist-list', reverse('watchlist-list'))],
+            'forum-post-list': [('forum-post-list', reverse('forum-post-list'))],
+            'forum-search': [('forum-search', reverse('forum-search') + '?q=training')],
+            'forum-comments': [('forum-comments', reverse('forum-comments', args=[post.id]))],
+        }
+        event = {'pet': pet.id, 'event_type': 'CHECKUP', 'event_title': 'Benchmark',
+                 'start_date': (today + timedelta(days=7)).isoformat()}
+        # записи додають рядки, тож навантажуються лише з --include-writes
+        writes = {
+            'signin': [('signin', reverse('signin'), 'POST',
+                        {'email': user.email, 'password': options['password']})],
+            'calendar-list': [('calendar-create', reverse('calendar-list'), 'POST', event)],
+            'calendar-bulk': [('calendar-bulk', reverse('calendar-bulk'), 'POST',
+                               [{'op': 'create', 'data': event}] * 10)],
+            'journal-list': [('journal-create', reverse('journal-list'), 'POST',
+                              {'pet': pet.id, 'entry_type': 'TRAINING', 'entry_title': 'Benchmark walk'})],
+            'forum-post-list': [('forum-create', reverse('forum-post-list'), 'POST', {'post_text': 'Benchmark'})],
+            'forum-comments': [('forum-comment', reverse('forum-comments', args=[post.id]), 'POST',
+                                {'comment_text': 'Benchmark'})],
+            'forum-like': [('forum-like', reverse('forum-like', args=[post.id]), 'POST', {})],
+        }
+
+        targets, skipped = [], {}
+        for name in _route_names(get_resolver().url_patterns):
+            covered = name in reads or name in writes
+            targets += reads.get(name, [])
+            if options['include_writes']:
+                targets += [(*target[:3], json.dumps(target[3]).encode()) for target in writes.get(name, [])]
+            elif name in writes and name not in reads:
+                skipped[name] = 'write; enable with --include-writes'
+            if not covered:
+                skipped[name] = SKIPPED.get(name, 'no benchmark target defined')
+        return targets, skipped
+
+    def compare(self, report, baseline_path, max_regression):
+        if not baseline_path:
+            return None
+        with open(baseline_path) as file:
+            baseline = json.load(file)['endpoints']
+        regressions = {}
+        for name, current in report['endpoints'].items():
+            before = baseline.get(name, {}).get('p95_ms')
+            if before and current['p95_ms'] and current['p95_ms'] > before * (1 + max_regression):
+                regressions[name] = {'p95_ms_before': before, 'p95_ms': current['p95_ms']}
+        return regressions
+
+
+def _route_names(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            # admin і вкладені застосунки не є API проєкту
+            if pattern.namespace is None:
+                yield from _route_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern.name
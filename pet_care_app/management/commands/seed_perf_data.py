@@ -0,0 +1,155 @@
+import json
+import random
+from contextlib import contextmanager
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from pet_care_app.catalog import invalidate_partner_catalog
+from pet_care_app.models import (PARTNER_TYPES, SEX_CHOICES, TYPE_CHOICES, CalendarEvent, EventRecurrence,
+                                 ForumComment, ForumLike, ForumPost, JournalEntry, PartnerWatchlist, Pet,
+                                 SitePartner, User)
+from pet_care_app.recurrence import last_occurrence
+
+BREEDS = ('Mixed', 'Labrador', 'Beagle', 'Husky', 'Maine Coon', 'Sphynx', 'Corgi', 'Poodle')
+WORDS = ('прогулянка', 'парк', 'корм', 'ветеринар', 'щеплення', 'грумінг', 'іграшка', 'дресирування',
+         'walk', 'vet', 'food', 'training', 'toy', 'bath', 'fleas', 'vitamins', 'sleep', 'ball')
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    # bulk_create з auto_now_add перезаписав би згенеровані дати поточним часом
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = ('Generates synthetic users, pets, calendar events, journal entries, forum posts, comments, likes, '
+            'partners and watchlist rows with bulk_create for load tests. Users are <prefix><n>@example.com.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--pets-per-user', type=int, default=2)
+        parser.add_argument('--events-per-pet', type=int, default=40)
+        parser.add_argument('--recurring-share', type=float, default=0.1, help='Share of events that repeat.')
+        parser.add_argument('--journal-per-pet', type=int, default=60)
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--comments-per-post', type=int, default=8)
+        parser.add_argument('--likes-per-post', type=int, default=15)
+        parser.add_argument('--partners', type=int, default=300)
+        parser.add_argument('--watchlist-per-user', type=int, default=5)
+        parser.add_argument('--days', type=int, default=730, help='History spread over this many past days.')
+        parser.add_argument('--prefix', default='perf', help='Email prefix of the generated users.')
+        parser.add_argument('--password', default='perf-password')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed; the same seed gives the same data.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.batch_size = options['batch_size']
+        with transaction.atomic():
+            counts = self.seed(options)
+        # bulk_create не шле сигналів, тож кешований каталог партнерів скидаємо вручну
+        invalidate_partner_catalog()
+        self.stdout.write(json.dumps({'user': f'{options["prefix"]}0@example.com', 'created': counts}, indent=2))
+
+    def _create(self, model, rows):
+        return model.objects.bulk_create(rows, batch_size=self.batch_size)
+
+    def _past(self, days):
+        return self.now - timedelta(days=self.random.random() * days)
+
+    def _text(self, words):
+        return ' '.join(self.random.choice(WORDS) for _ in range(words)).capitalize()
+
+    def seed(self, options):
+        rnd = self.random
+        days = options['days']
+        # один хеш на всіх: PBKDF2 на кожного користувача зайняв би хвилини
+        password = make_password(options['password'])
+        users = self._create(User, [
+            User(email=f'{options["prefix"]}{i}@example.com', full_name=f'Perf User {i}', password=password)
+            for i in range(options['users'])
+        ])
+        pets = self._create(Pet, [
+            Pet(user=user, pet_name=f'{user.full_name.split()[-1]}-{n}', breed=rnd.choice(BREEDS),
+                sex=rnd.choice(SEX_CHOICES)[0], birthday=date(2010, 1, 1) + timedelta(days=rnd.randrange(5000)),
+                photo_url=f'https://cdn.example.com/pets/{user.id}-{n}.webp')
+            for user in users for n in range(options['pets_per_user'])
+        ])
+
+        today = timezone.localdate()
+        events = self._create(CalendarEvent, [
+            CalendarEvent(pet=pet, event_type=rnd.choice(TYPE_CHOICES)[0], event_title=self._text(3),
+                          start_date=today + timedelta(days=rnd.randrange(-days, 180)),
+                          start_time=time(rnd.randrange(8, 20), rnd.choice((0, 30))) if rnd.random() < 0.7 else None,
+                          description=self._text(12), completed=rnd.random() < 0.5)
+            for pet in pets for _ in range(options['events_per_pet'])
+        ])
+        recurrences = []
+        for event in events:
+            if rnd.random() >= options['recurring_share']:
+                continue
+            freq, interval = rnd.choice((('DAILY', 1), ('WEEKLY', 1), ('WEEKLY', 2), ('MONTHLY', 1), ('YEARLY', 1)))
+            count = rnd.choice((None, 5, 12, 52))
+            # bulk_create не викликає save(), тож ends_on рахуємо тут
+            recurrences.append(EventRecurrence(
+                event=event, freq=freq, interval=interval, count=count,
+                ends_on=last_occurrence(event.start_date, freq, interval, count, None),
+            ))
+        self._create(EventRecurrence, recurrences)
+
+        created_at = JournalEntry._meta.get_field('created_at')
+        with explicit_timestamps(created_at):
+            entries = self._create(JournalEntry, [
+                JournalEntry(pet=pet, entry_type=rnd.choice(TYPE_CHOICES)[0], entry_title=self._text(4),
+                             description=self._text(rnd.randrange(10, 60)), created_at=self._past(days))
+                for pet in pets for _ in range(options['journal_per_pet'])
+            ])
+
+        likes_per_post = min(options['likes_per_post'], len(users))
+        post_created_at = ForumPost._meta.get_field('created_at')
+        comment_created_at = ForumComment._meta.get_field('created_at')
+        with explicit_timestamps(post_created_at, comment_created_at):
+            posts = self._create(ForumPost, [
+                ForumPost(user=rnd.choice(users), post_text=self._text(rnd.randrange(15, 120)),
+                          created_at=self._past(days), comments_count=options['comments_per_post'],
+                          likes_count=likes_per_post)
+                for _ in range(options['posts'])
+            ])
+            comments = self._create(ForumComment, [
+                ForumComment(forum_post=post, user=rnd.choice(users), comment_text=self._text(rnd.randrange(3, 30)),
+                             created_at=post.created_at + timedelta(minutes=rnd.randrange(1, 10000)))
+                for post in posts for _ in range(options['comments_per_post'])
+            ])
+        likes = self._create(ForumLike, [
+            ForumLike(forum_post=post, user=user)
+            for post in posts for user in rnd.sample(users, likes_per_post)
+        ])
+
+        partners = self._create(SitePartner, [
+            SitePartner(site_name=f'Partner {i}', site_url=f'https://partner{i}.example.com',
+                        partner_type=rnd.choice(PARTNER_TYPES)[0], rating=Decimal(rnd.randrange(10, 50)) / 10)
+            for i in range(options['partners'])
+        ])
+        watchlist_size = min(options['watchlist_per_user'], len(partners))
+        watchlist = self._create(PartnerWatchlist, [
+            PartnerWatchlist(user=user, partner=partner)
+            for user in users for partner in rnd.sample(partners, watchlist_size)
+        ])
+        return {
+            'users': len(users), 'pets': len(pets), 'calendar_events': len(events),
+            'recurring_events': len(recurrences), 'journal_entries': len(entries), 'forum_posts': len(posts),
+            'forum_comments': len(comments), 'forum_likes': len(likes), 'partners': len(partners),
+            'watchlist_entries': len(watchlist),
+        }
@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from pet_care_app.models import CalendarEvent
+from pet_care_app.reminders import dispatch_due_reminders, get_notifier, schedule_reminders
+
+
+class Command(BaseCommand):
+    help = ('Sends due calendar reminders in batches. Several workers can run at once: rows are claimed '
+            'with SELECT ... FOR UPDATE SKIP LOCKED and leased for CALENDAR_REMINDER_LEASE_SECONDS while sending.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.CALENDAR_REMINDER_BATCH_SIZE)
+        parser.add_argument('--poll-interval', type=float, default=5.0,
+                            help='Seconds to sleep when nothing is due.')
+        parser.add_argument('--once', action='store_true', help='Exit once no reminders are due (cron mode).')
+        parser.add_argument('--backfill', action='store_true',
+                            help='Schedule reminders for upcoming events that have none, then exit.')
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            self.backfill(options['batch_size'])
+            return
+        notifier = get_notifier()
+        total = 0
+        try:
+            while True:
+                # довгоживучий процес: закриває з'єднання, що перевищили CONN_MAX_AGE або зламались
+                close_old_connections()
+                processed = dispatch_due_reminders(notifier, options['batch_size'])
+                total += processed
+                if processed:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'{total} reminders processed'))
+
+    def backfill(self, batch_size):
+        today = timezone.localdate()
+        events = CalendarEvent.objects.filter(reminder__isnull=True, start_date__isnull=False).filter(
+            Q(recurrence__isnull=True, completed=False, start_date__gte=today)
+            | Q(recurrence__isnull=False)
+            & (Q(recurrence__ends_on__isnull=True) | Q(recurrence__ends_on__gte=today))
+        ).order_by('id').values_list('id', flat=True)
+        last_id, total = 0, 0
+        while True:
+            # keyset по id, а не відкритий курсор: schedule_reminders пише між вибірками
+            batch = list(events.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            schedule_reminders(batch)
+            last_id, total = batch[-1], total + len(batch)
+        self.stdout.write(self.style.SUCCESS(f'{total} events scheduled'))
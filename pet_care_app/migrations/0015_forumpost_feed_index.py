@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0014_alter_partnerwatchlist_table'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='forumpost',
+            index=models.Index(fields=['-created_at', '-id'], name='forum_posts_feed_idx'),
+        ),
+    ]
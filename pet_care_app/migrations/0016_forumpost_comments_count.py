@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 00:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comments_count(apps, schema_editor):
+    ForumPost = apps.get_model('pet_care_app', 'ForumPost')
+    ForumComment = apps.get_model('pet_care_app', 'ForumComment')
+    counts = (
+        ForumComment.objects.filter(forum_post=OuterRef('pk'))
+        .order_by().values('forum_post').annotate(total=Count('id')).values('total')
+    )
+    ForumPost.objects.update(comments_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0015_forumpost_feed_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumpost',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_comments_count, migrations.RunPython.noop),
+    ]
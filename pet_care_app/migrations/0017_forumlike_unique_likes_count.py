@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-18 00:34
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_likes(apps, schema_editor):
+    ForumLike = apps.get_model('pet_care_app', 'ForumLike')
+    keep = (
+        ForumLike.objects.values('user', 'forum_post')
+        .annotate(first_id=Min('id')).values('first_id')
+    )
+    ForumLike.objects.exclude(id__in=keep).delete()
+
+
+def backfill_likes_count(apps, schema_editor):
+    ForumPost = apps.get_model('pet_care_app', 'ForumPost')
+    ForumLike = apps.get_model('pet_care_app', 'ForumLike')
+    counts = (
+        ForumLike.objects.filter(forum_post=OuterRef('pk'))
+        .order_by().values('forum_post').annotate(total=Count('id')).values('total')
+    )
+    ForumPost.objects.update(likes_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0016_forumpost_comments_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumpost',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(remove_duplicate_likes, migrations.RunPython.noop),
+        migrations.RunPython(backfill_likes_count, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='forumlike',
+            constraint=models.UniqueConstraint(fields=('user', 'forum_post'), name='forum_likes_user_post_uniq'),
+        ),
+    ]
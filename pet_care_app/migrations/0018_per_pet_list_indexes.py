@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 00:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0017_forumlike_unique_likes_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['pet', 'start_date', 'start_time'], name='calendar_events_pet_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='forumcomment',
+            index=models.Index(fields=['forum_post', 'created_at', 'id'], name='forum_comments_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['pet', '-created_at'], name='journal_entries_pet_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 00:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0018_per_pet_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumpost',
+            name='photo_status',
+            field=models.CharField(blank=True, choices=[('PENDING', 'Завантажується'), ('READY', 'Готово'), ('FAILED', 'Помилка завантаження')], max_length=8, null=True),
+        ),
+        migrations.AddField(
+            model_name='pet',
+            name='photo_status',
+            field=models.CharField(blank=True, choices=[('PENDING', 'Завантажується'), ('READY', 'Готово'), ('FAILED', 'Помилка завантаження')], max_length=8, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='photo_status',
+            field=models.CharField(blank=True, choices=[('PENDING', 'Завантажується'), ('READY', 'Готово'), ('FAILED', 'Помилка завантаження')], max_length=8, null=True),
+        ),
+    ]
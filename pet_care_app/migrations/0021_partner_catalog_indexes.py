@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0020_photo_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sitepartner',
+            index=models.Index(fields=['partner_type', '-rating', '-id'], name='partner_sites_type_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sitepartner',
+            index=models.Index(fields=['-rating', '-id'], name='partner_sites_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 00:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0021_partner_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('collection', models.CharField(max_length=20)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='collection_versions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'Collection_versions',
+                'constraints': [models.UniqueConstraint(fields=('user', 'collection'), name='collection_versions_user_uniq')],
+            },
+        ),
+    ]
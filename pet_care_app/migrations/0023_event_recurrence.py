@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-18 00:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0022_collection_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRecurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('freq', models.CharField(choices=[('DAILY', 'Щодня'), ('WEEKLY', 'Щотижня'), ('MONTHLY', 'Щомісяця'), ('YEARLY', 'Щороку')], max_length=8)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('until', models.DateField(blank=True, null=True)),
+                ('count', models.PositiveIntegerField(blank=True, null=True)),
+                ('exdates', models.JSONField(blank=True, default=list)),
+                ('ends_on', models.DateField(blank=True, editable=False, null=True)),
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='recurrence', to='pet_care_app.calendarevent')),
+            ],
+            options={
+                'db_table': 'Calendar_event_recurrences',
+            },
+        ),
+        migrations.CreateModel(
+            name='EventOccurrenceOverride',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurrence_date', models.DateField()),
+                ('completed', models.BooleanField(default=False)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='overrides', to='pet_care_app.calendarevent')),
+            ],
+            options={
+                'db_table': 'Calendar_event_overrides',
+                'constraints': [models.UniqueConstraint(fields=('event', 'occurrence_date'), name='calendar_override_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2 on 2026-10-18 00:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from pet_care_app.migration_operations import AddIndexOnPostgres
+
+# Конфігурація 'simple': для української в PostgreSQL немає вбудованого словника
+POSTGRES_FORWARDS = [
+    """
+    CREATE FUNCTION journal_entries_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.entry_title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER journal_entries_search_vector_trg
+    BEFORE INSERT OR UPDATE OF entry_title, description ON "Journal_entries"
+    FOR EACH ROW EXECUTE FUNCTION journal_entries_search_vector()
+    """,
+    """
+    UPDATE "Journal_entries" SET search_vector =
+        setweight(to_tsvector('simple', coalesce(entry_title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    """,
+]
+
+POSTGRES_BACKWARDS = [
+    'DROP TRIGGER IF EXISTS journal_entries_search_vector_trg ON "Journal_entries"',
+    'DROP FUNCTION IF EXISTS journal_entries_search_vector()',
+]
+
+# Зовнішня FTS5-таблиця: індексує рядки Journal_entries без копії тексту
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE journal_entries_fts USING fts5(
+        entry_title, description, content='Journal_entries', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER journal_entries_fts_ai AFTER INSERT ON "Journal_entries" BEGIN
+        INSERT INTO journal_entries_fts(rowid, entry_title, description)
+        VALUES (new.id, new.entry_title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER journal_entries_fts_ad AFTER DELETE ON "Journal_entries" BEGIN
+        INSERT INTO journal_entries_fts(journal_entries_fts, rowid, entry_title, description)
+        VALUES ('delete', old.id, old.entry_title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER journal_entries_fts_au AFTER UPDATE OF entry_title, description ON "Journal_entries" BEGIN
+        INSERT INTO journal_entries_fts(journal_entries_fts, rowid, entry_title, description)
+        VALUES ('delete', old.id, old.entry_title, old.description);
+        INSERT INTO journal_entries_fts(rowid, entry_title, description)
+        VALUES (new.id, new.entry_title, new.description);
+    END
+    """,
+    "INSERT INTO journal_entries_fts(journal_entries_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARDS = [
+    'DROP TRIGGER IF EXISTS journal_entries_fts_ai',
+    'DROP TRIGGER IF EXISTS journal_entries_fts_ad',
+    'DROP TRIGGER IF EXISTS journal_entries_fts_au',
+    'DROP TABLE IF EXISTS journal_entries_fts',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0023_event_recurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalentry',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        AddIndexOnPostgres(
+            model_name='journalentry',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='journal_entries_search_idx'),
+        ),
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARDS, 'sqlite': SQLITE_FORWARDS}),
+            _run({'postgresql': POSTGRES_BACKWARDS, 'sqlite': SQLITE_BACKWARDS}),
+        ),
+    ]
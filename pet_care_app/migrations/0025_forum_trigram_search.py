@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 00:58
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from pet_care_app.migration_operations import AddIndexOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0024_journal_search'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexOnPostgres(
+            model_name='forumcomment',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['comment_text'], name='forum_comments_text_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexOnPostgres(
+            model_name='forumpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['post_text'], name='forum_posts_text_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pet_care_app', '0026_event_reminders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumpost',
+            name='photo_pending_since',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pet',
+            name='photo_pending_since',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='photo_pending_since',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
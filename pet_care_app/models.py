@@ -1,9 +1,13 @@
-from django.db import models
+from django.db import connection, models
 from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from datetime import date
 
+from .recurrence import dates_in_window, last_occurrence
+
 SEX_CHOICES = (
     ('MALE', 'Чоловіча'),
     ('FEMALE', 'Жіноча'),
@@ -19,6 +23,19 @@ TYPE_CHOICES = (
     ('OTHER', 'Інше'),
 )
 
+RECURRENCE_FREQ_CHOICES = (
+    ('DAILY', 'Щодня'),
+    ('WEEKLY', 'Щотижня'),
+    ('MONTHLY', 'Щомісяця'),
+    ('YEARLY', 'Щороку'),
+)
+
+PHOTO_STATUS_CHOICES = (
+    ('PENDING', 'Завантажується'),
+    ('READY', 'Готово'),
+    ('FAILED', 'Помилка завантаження'),
+)
+
 PARTNER_TYPES = [
     ('CLINIC', 'Ветеринарна клініка'),
     ('GROOMING_SALON', 'Грумінг-салон'),
@@ -49,6 +66,10 @@ class SitePartner(models.Model):
 
     class Meta:
         db_table = 'Partner_sites'
+        indexes = [
+            models.Index(fields=['partner_type', '-rating', '-id'], name='partner_sites_type_rating_idx'),
+            models.Index(fields=['-rating', '-id'], name='partner_sites_rating_idx'),
+        ]
 
 
 class CustomUserManager(BaseUserManager):
@@ -82,6 +103,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     full_name = models.CharField(max_length=255)
     email = models.EmailField(max_length=255, unique=True)
     photo_url = models.URLField(max_length=255, blank=True, null=True)
+    photo_status = models.CharField(max_length=8, choices=PHOTO_STATUS_CHOICES, blank=True, null=True)
+    photo_pending_since = models.DateTimeField(blank=True, null=True, editable=False)
+    photo_variants = models.JSONField(default=dict, blank=True)
 
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
@@ -122,6 +146,9 @@ class Pet(models.Model):
     sex = models.CharField(max_length=8, choices=SEX_CHOICES, default='FEMALE')
     birthday = models.DateField(validators=[validate_birthday])
     photo_url = models.URLField(max_length=255, blank=True, null=True)
+    photo_status = models.CharField(max_length=8, choices=PHOTO_STATUS_CHOICES, blank=True, null=True)
+    photo_pending_since = models.DateTimeField(blank=True, null=True, editable=False)
+    photo_variants = models.JSONField(default=dict, blank=True)
 
     def __str__(self):
         return f'{self.pet_name} ({self.breed})'
@@ -130,6 +157,27 @@ class Pet(models.Model):
         db_table = 'Pets'
 
 
+def month_bounds(year, month):
+    # Напіввідкритий діапазон [1-ше число, 1-ше число наступного місяця)
+    return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+
+
+class CalendarEventQuerySet(models.QuerySet):
+    def for_month(self, user, year, month, pet_id=None):
+        # Діапазон замість start_date__year/__month, щоб запит міг іти по індексу
+        start, end = month_bounds(year, month)
+        # Повторювані події потрапляють у вибірку, якщо серія перетинає місяць; їхні повторення
+        # і стан (overrides) розгортає CalendarEventListView через recurrence.dates_in_window
+        events = self.filter(pet__user_id=user.id).filter(
+            models.Q(recurrence__isnull=True, start_date__gte=start, start_date__lt=end)
+            | models.Q(recurrence__isnull=False, start_date__lt=end)
+            & (models.Q(recurrence__ends_on__isnull=True) | models.Q(recurrence__ends_on__gte=start))
+        )
+        if pet_id:
+            events = events.filter(pet_id=pet_id)
+        return events
+
+
 class CalendarEvent(models.Model):
     pet = models.ForeignKey(Pet, related_name='calendar_events', on_delete=models.CASCADE)
     event_type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='OTHER')
@@ -139,11 +187,78 @@ class CalendarEvent(models.Model):
     description = models.TextField(blank=True, null=True)
     completed = models.BooleanField(default=False)
 
+    objects = CalendarEventQuerySet.as_manager()
+
     def __str__(self):
         return f'{self.event_title} on {self.start_date}'
 
     class Meta:
         db_table = 'Calendar_events'
+        indexes = [
+            models.Index(fields=['pet', 'start_date', 'start_time'], name='calendar_events_pet_idx'),
+        ]
+
+
+class EventRecurrence(models.Model):
+    # Підмножина RRULE: FREQ, INTERVAL, UNTIL/COUNT, EXDATE; DTSTART - це start_date події
+    event = models.OneToOneField(CalendarEvent, related_name='recurrence', on_delete=models.CASCADE)
+    freq = models.CharField(max_length=8, choices=RECURRENCE_FREQ_CHOICES)
+    interval = models.PositiveSmallIntegerField(default=1)
+    until = models.DateField(blank=True, null=True)
+    count = models.PositiveIntegerField(blank=True, null=True)
+    exdates = models.JSONField(default=list, blank=True)
+    # остання дата серії (з until/count), null - безкінечна; для фільтра за місяцем
+    ends_on = models.DateField(blank=True, null=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        self.ends_on = last_occurrence(self.event.start_date, self.freq, self.interval, self.count, self.until)
+        super().save(*args, **kwargs)
+
+    def dates_between(self, start, end):
+        return dates_in_window(
+            self.event.start_date, self.freq, self.interval, self.ends_on, self.exdates, start, end
+        )
+
+    def __str__(self):
+        return f'{self.freq} x{self.interval} for {self.event}'
+
+    class Meta:
+        db_table = 'Calendar_event_recurrences'
+
+
+class EventOccurrenceOverride(models.Model):
+    # Стан окремого повторення; рядок є лише для змінених повторень
+    event = models.ForeignKey(CalendarEvent, related_name='overrides', on_delete=models.CASCADE)
+    occurrence_date = models.DateField()
+    completed = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = 'Calendar_event_overrides'
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'occurrence_date'], name='calendar_override_uniq'),
+        ]
+
+
+class EventReminder(models.Model):
+    # Наступне нагадування про подію; для серії - про найближче повторення.
+    # due_at = null - нагадувати нема про що, такі рядки не потрапляють у частковий індекс
+    event = models.OneToOneField(CalendarEvent, related_name='reminder', on_delete=models.CASCADE)
+    occurrence_date = models.DateField(blank=True, null=True)
+    due_at = models.DateTimeField(blank=True, null=True)
+    # останнє повторення, про яке вже нагадали - щоб не надіслати вдруге після перепланування
+    sent_for = models.DateField(blank=True, null=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return f'Reminder for {self.event_id} due {self.due_at}'
+
+    class Meta:
+        db_table = 'Calendar_event_reminders'
+        indexes = [
+            models.Index(fields=['due_at'], name='event_reminders_due_idx', condition=models.Q(due_at__isnull=False)),
+        ]
 
 
 class JournalEntry(models.Model):
@@ -152,25 +267,56 @@ class JournalEntry(models.Model):
     entry_title = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     description = models.TextField(blank=True, null=True)
+    # PostgreSQL: заповнюється тригером (міграція 0024); в SQLite пошук іде через FTS5-таблицю
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return self.entry_title
 
     class Meta:
         db_table = 'Journal_entries'
+        indexes = [
+            models.Index(fields=['pet', '-created_at'], name='journal_entries_pet_idx'),
+            GinIndex(fields=['search_vector'], name='journal_entries_search_idx'),
+        ]
+
+
+class ForumPostQuerySet(models.QuerySet):
+    def for_feed(self, user, comment_preview=3):
+        if user.is_authenticated:
+            has_liked = models.Exists(
+                ForumLike.objects.filter(forum_post=models.OuterRef('pk'), user_id=user.id)
+            )
+        else:
+            has_liked = models.Value(False, output_field=models.BooleanField())
+        comments = ForumComment.objects.select_related('user').order_by('-created_at', '-id')
+        return self.select_related('user').annotate(has_liked=has_liked).prefetch_related(
+            models.Prefetch('comments', queryset=comments[:comment_preview], to_attr='latest_comments')
+        )
 
 
 class ForumPost(models.Model):
     user = models.ForeignKey(User, related_name='forum_posts', on_delete=models.CASCADE)
     post_text = models.TextField(blank=True, null=True)
     photo_url = models.URLField(max_length=255, blank=True, null=True)
+    photo_status = models.CharField(max_length=8, choices=PHOTO_STATUS_CHOICES, blank=True, null=True)
+    photo_pending_since = models.DateTimeField(blank=True, null=True, editable=False)
+    photo_variants = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    comments_count = models.PositiveIntegerField(default=0)
+    likes_count = models.PositiveIntegerField(default=0)
+
+    objects = ForumPostQuerySet.as_manager()
 
     def __str__(self):
         return f'Post #{self.id} by {self.user.full_name}'
 
     class Meta:
         db_table = 'Forum_posts'
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='forum_posts_feed_idx'),
+            GinIndex(fields=['post_text'], opclasses=['gin_trgm_ops'], name='forum_posts_text_trgm_idx'),
+        ]
 
 
 class ForumComment(models.Model):
@@ -184,6 +330,10 @@ class ForumComment(models.Model):
 
     class Meta:
         db_table = 'Forum_comments'
+        indexes = [
+            models.Index(fields=['forum_post', 'created_at', 'id'], name='forum_comments_thread_idx'),
+            GinIndex(fields=['comment_text'], opclasses=['gin_trgm_ops'], name='forum_comments_text_trgm_idx'),
+        ]
 
 
 class ForumLike(models.Model):
@@ -193,5 +343,79 @@ class ForumLike(models.Model):
     def __str__(self):
         return f'Like #{self.id} by {self.user.full_name}'
 
+    @classmethod
+    def toggle(cls, user_id, forum_post_id):
+        # Повертає (liked, likes_count); викликати всередині transaction.atomic().
+        # Два запити на будь-який шлях: INSERT і UPDATE лічильника або INSERT і DELETE+UPDATE одним CTE
+        qn = connection.ops.quote_name
+        likes = qn(cls._meta.db_table)
+        posts = qn(ForumPost._meta.db_table)
+        mine = f'{qn("user_id")} = %s AND {qn("forum_post_id")} = %s'
+        counter = f'UPDATE {posts} SET {qn("likes_count")} = {qn("likes_count")} + %s'
+        returning = f'WHERE {qn("id")} = %s RETURNING {qn("likes_count")}'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {likes} ({qn("user_id")}, {qn("forum_post_id")}) VALUES (%s, %s) '
+                f'ON CONFLICT DO NOTHING RETURNING {qn("id")}',
+                [user_id, forum_post_id]
+            )
+            liked = cursor.fetchone() is not None
+            if liked:
+                cursor.execute(f'{counter} {returning}', [1, forum_post_id])
+            elif connection.vendor == 'postgresql':
+                # рядок міг зникнути між INSERT і DELETE - тоді COUNT(*) = 0 і лічильник не змінюється
+                cursor.execute(
+                    f'WITH deleted AS (DELETE FROM {likes} WHERE {mine} RETURNING 1) '
+                    f'{counter} * (SELECT COUNT(*) FROM deleted) {returning}',
+                    [user_id, forum_post_id, -1, forum_post_id]
+                )
+            else:
+                # SQLite не дозволяє DELETE у CTE
+                cursor.execute(f'DELETE FROM {likes} WHERE {mine}', [user_id, forum_post_id])
+                cursor.execute(f'{counter} {returning}', [-cursor.rowcount, forum_post_id])
+            row = cursor.fetchone()
+        if row is None:
+            raise ForumPost.DoesNotExist
+        return liked, row[0]
+
     class Meta:
         db_table = 'Forum_likes'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'forum_post'], name='forum_likes_user_post_uniq'),
+        ]
+
+
+class CollectionVersion(models.Model):
+    # Лічильник змін колекції користувача (pets/calendar/journal) для ETag списків
+    user = models.ForeignKey(User, related_name='collection_versions', on_delete=models.CASCADE)
+    collection = models.CharField(max_length=20)
+    version = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def bump(cls, user_id, *collections):
+        if not collections:
+            return
+        qn = connection.ops.quote_name
+        table = qn(cls._meta.db_table)
+        values = ', '.join(['(%s, %s, 1)'] * len(collections))
+        params = [value for collection in collections for value in (user_id, collection)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({qn("user_id")}, {qn("collection")}, {qn("version")}) VALUES {values} '
+                f'ON CONFLICT ({qn("user_id")}, {qn("collection")}) '
+                f'DO UPDATE SET {qn("version")} = {table}.{qn("version")} + 1',
+                params
+            )
+
+    @classmethod
+    async def aget_version(cls, user_id, collection):
+        version = await cls.objects.filter(
+            user_id=user_id, collection=collection
+        ).values_list('version', flat=True).afirst()
+        return version or 0
+
+    class Meta:
+        db_table = 'Collection_versions'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'collection'], name='collection_versions_user_uniq'),
+        ]
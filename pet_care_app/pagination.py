@@ -0,0 +1,110 @@
+import base64
+import json
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+
+class KeysetPaginator:
+    cursor_param = 'cursor'
+    page_size_param = 'page_size'
+
+    def __init__(self, ordering, page_size, max_page_size):
+        self.ordering = ordering
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+
+    def get_page_size(self, params):
+        raw = params.get(self.page_size_param)
+        if raw is None:
+            return self.page_size
+        try:
+            size = int(raw)
+        except ValueError:
+            raise ValidationError({self.page_size_param: 'Must be an integer.'})
+        if size < 1:
+            raise ValidationError({self.page_size_param: 'Must be positive.'})
+        return min(size, self.max_page_size)
+
+    def encode_cursor(self, row):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            values.append(value)
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (ValueError, TypeError):
+            raise ValidationError({self.cursor_param: 'Invalid cursor.'})
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValidationError({self.cursor_param: 'Invalid cursor.'})
+        return values
+
+    def after(self, values):
+        # (a, b) < (x, y)  ->  a <= x AND (a < x OR (a = x AND b < y))
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        first = self.ordering[0]
+        bound = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{bound}': values[0]}) & condition
+
+    def page_queryset(self, queryset, params):
+        # Повертає (queryset з LIMIT size + 1, size); зайвий рядок означає, що є наступна сторінка
+        size = self.get_page_size(params)
+        queryset = queryset.order_by(*self.ordering)
+        cursor = params.get(self.cursor_param)
+        if cursor:
+            try:
+                queryset = queryset.filter(self.after(self.decode_cursor(cursor)))
+            except (DjangoValidationError, TypeError, ValueError):
+                # значення підробленого курсора не приводяться до типів колонок
+                raise ValidationError({self.cursor_param: 'Invalid cursor.'})
+        return queryset[:size + 1], size
+
+    def build_page(self, rows, size):
+        next_cursor = self.encode_cursor(rows[size - 1]) if len(rows) > size else None
+        return rows[:size], next_cursor
+
+    def paginate(self, queryset, params):
+        queryset, size = self.page_queryset(queryset, params)
+        return self.build_page(list(queryset), size)
+
+    async def apaginate(self, queryset, params):
+        queryset, size = self.page_queryset(queryset, params)
+        return self.build_page([row async for row in queryset], size)
+
+    def page_union(self, querysets, params):
+        # Keyset поверх UNION ALL. Умову курсора кожна гілка застосовує сама (ключ у гілках може бути
+        # виразом, а порівнювати вигідніше по індексованій колонці); тут - LIMIT size + 1 і сортування.
+        # Де БД дозволяє (PostgreSQL), LIMIT і власне сортування гілки діють ще й усередині неї
+        size = self.get_page_size(params)
+        branches = []
+        for queryset in querysets:
+            if connections[queryset.db].features.supports_slicing_ordering_in_compound:
+                queryset = (queryset if queryset.query.order_by else queryset.order_by(*self.ordering))[:size + 1]
+            else:
+                queryset = queryset.order_by()
+            branches.append(queryset)
+        if len(querysets) == 1:
+            queryset = querysets[0]
+            return (queryset if queryset.query.order_by else queryset.order_by(*self.ordering))[:size + 1], size
+        return branches[0].union(*branches[1:], all=True).order_by(*self.ordering)[:size + 1], size
+
+    async def apaginate_union(self, querysets, params):
+        queryset, size = self.page_union(querysets, params)
+        return self.build_page([row async for row in queryset], size)
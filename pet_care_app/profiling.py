@@ -0,0 +1,163 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger('pet_care_app.perf')
+
+_profile = ContextVar('request_profile', default=None)
+
+# IN (%s, %s, ...) різної довжини - та сама форма запиту
+_IN_LIST = re.compile(r'\((?:%s, )*%s\)')
+_SPACES = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.shapes = Counter()
+        self.spans = Counter()
+
+    def add_query(self, sql, seconds):
+        self.queries += 1
+        self.db_seconds += seconds
+        self.shapes[_SPACES.sub(' ', _IN_LIST.sub('(...)', sql))] += 1
+
+    def repeated_queries(self):
+        # Однакові за формою запити, повторені понад поріг - типовий N+1
+        threshold = settings.PERF_N_PLUS_ONE_THRESHOLD
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def server_timing(self, total_ms):
+        metrics = [f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"']
+        metrics += [f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.spans.items()]
+        metrics.append(f'total;dur={total_ms:.1f}')
+        return ', '.join(metrics)
+
+
+@contextmanager
+def span(name):
+    # Час блоку додається до метрики name поточного запиту; поза запитом - нічого не робить
+    profile = _profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.spans[name] += time.perf_counter() - started
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query(sql, time.perf_counter() - started)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # Обгортка на кожному з'єднанні, включно з потоками sync_to_async; запит знаходить
+    # свій профіль через ContextVar, який asgiref копіює в ці потоки
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _view_budget(request):
+    # Атрибут query_budget класу view (або функції): найбільша допустима кількість SQL-запитів,
+    # число або {'GET': 2, ...} по методах
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view = getattr(match.func, 'view_class', match.func)
+    budget = getattr(view, 'query_budget', None)
+    return budget.get(request.method) if isinstance(budget, dict) else budget
+
+
+class PerformanceMiddleware:
+    # Кількість і час SQL, серіалізації та завантажень у сховище: заголовок Server-Timing
+    # і один структурований рядок логу на запит. Для StreamingHttpResponse міряється лише до
+    # початку віддачі тіла
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.PERF_INSTRUMENTATION:
+            return self.get_response(request)
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if not settings.PERF_INSTRUMENTATION:
+            return await self.get_response(request)
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _profile.reset(token)
+        return self.finish(request, response, profile)
+
+    def finish(self, request, response, profile):
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        if settings.PERF_SERVER_TIMING:
+            response['Server-Timing'] = profile.server_timing(total_ms)
+
+        repeated = profile.repeated_queries()
+        budget = _view_budget(request)
+        over_budget = budget is not None and profile.queries > budget
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 1),
+            'db_ms': round(profile.db_seconds * 1000, 1),
+            'queries': profile.queries,
+            **{f'{name}_ms': round(seconds * 1000, 1) for name, seconds in profile.spans.items()},
+        }
+        if repeated:
+            record['n_plus_one'] = [{'sql': shape[:300], 'count': count} for shape, count in repeated]
+        if budget is not None:
+            record['query_budget'] = budget
+        level = logging.WARNING if repeated or over_budget else logging.INFO
+        logger.log(level, json.dumps(record, ensure_ascii=False))
+
+        if over_budget and settings.PERF_STRICT_QUERY_BUDGET:
+            shapes = '\n'.join(f'{count}x {shape}' for shape, count in profile.shapes.most_common())
+            raise QueryBudgetExceeded(
+                f'{record["view"]} made {profile.queries} queries, budget is {budget}:\n{shapes}'
+            )
+        return response
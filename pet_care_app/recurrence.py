@@ -0,0 +1,120 @@
+from datetime import MAXYEAR, date, timedelta
+
+DAILY = 'DAILY'
+WEEKLY = 'WEEKLY'
+MONTHLY = 'MONTHLY'
+YEARLY = 'YEARLY'
+
+
+def _nth(start, freq, interval, k):
+    # k-те повторення від start; None, якщо такої дати немає (31-ше у квітні, 29 лютого),
+    # такі дати пропускаються, як у RRULE. (None, None) - повторення вже після date.max
+    if freq in (DAILY, WEEKLY):
+        step = interval * (7 if freq == WEEKLY else 1)
+        try:
+            return start + timedelta(days=k * step), None
+        except OverflowError:
+            return None, None
+    if freq == MONTHLY:
+        months = start.month - 1 + k * interval
+        year, month = start.year + months // 12, months % 12 + 1
+    else:
+        year, month = start.year + k * interval, start.month
+    if year > MAXYEAR:
+        return None, None
+    try:
+        return date(year, month, start.day), None
+    except ValueError:
+        return None, date(year, month, 1)
+
+
+def _first_index(start, freq, interval, from_date):
+    if from_date <= start:
+        return 0
+    if freq in (DAILY, WEEKLY):
+        step = interval * (7 if freq == WEEKLY else 1)
+        return -(-(from_date - start).days // step)
+    if freq == MONTHLY:
+        elapsed = (from_date.year - start.year) * 12 + from_date.month - start.month
+    else:
+        elapsed = from_date.year - start.year
+    return max(0, elapsed // interval)
+
+
+def occurrences(start, freq, interval, from_date, to_date):
+    # Дати повторень у [from_date, to_date); перший індекс рахується арифметично,
+    # тож вартість залежить від розміру вікна, а не від довжини серії
+    k = _first_index(start, freq, interval, from_date)
+    while True:
+        day, skipped_month = _nth(start, freq, interval, k)
+        k += 1
+        if day is None:
+            if skipped_month is None or skipped_month >= to_date:
+                return
+            continue
+        if day >= to_date:
+            return
+        if day >= from_date:
+            yield day
+
+
+def dates_in_window(series_start, freq, interval, ends_on, exdates, start, end):
+    # Повторення серії в [start, end) з урахуванням кінця серії та виключених дат (ISO-рядки)
+    start = max(start, series_start)
+    if ends_on is not None and ends_on < end:
+        end = ends_on + timedelta(days=1)
+    if start >= end:
+        return []
+    excluded = set(exdates)
+    return [
+        day for day in occurrences(series_start, freq, interval, start, end)
+        if day.isoformat() not in excluded
+    ]
+
+
+def next_date(series_start, freq, interval, ends_on, exdates, from_date):
+    # Перше повторення серії, не раніше from_date; None, якщо серія вже закінчилась
+    end = ends_on + timedelta(days=1) if ends_on is not None and ends_on < date.max else date.max
+    excluded = set(exdates)
+    for day in occurrences(series_start, freq, interval, max(from_date, series_start), end):
+        if day.isoformat() not in excluded:
+            return day
+    return None
+
+
+def last_occurrence(start, freq, interval, count=None, until=None):
+    # Дата останнього повторення серії або None для безкінечної
+    if count:
+        k = found = 0
+        last = None
+        while True:
+            day, skipped_month = _nth(start, freq, interval, k)
+            k += 1
+            if day is None:
+                if skipped_month is None:
+                    break
+                continue
+            if until and day > until:
+                break
+            found += 1
+            last = day
+            if found == count:
+                return last
+        return last
+    return until
+
+
+def runs_past_date_max(start, freq, interval, count=None, until=None):
+    # True, якщо серія не вміщується до date.max: не всі count повторень або,
+    # для безкінечної, навіть друге повторення лежать за межею
+    if until:
+        return False
+    needed, k = count or 2, 0
+    while needed:
+        day, skipped_month = _nth(start, freq, interval, k)
+        k += 1
+        if day is None and skipped_month is None:
+            return True
+        if day is not None:
+            needed -= 1
+    return False
@@ -0,0 +1,159 @@
+import logging
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core import mail
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import CalendarEvent, EventOccurrenceOverride, EventReminder
+from .recurrence import next_date
+
+logger = logging.getLogger(__name__)
+
+
+def _occurs_at(day, start_time):
+    default = time.fromisoformat(settings.CALENDAR_REMINDER_DEFAULT_TIME)
+    return timezone.make_aware(datetime.combine(day, start_time or default))
+
+
+def next_reminder(event, sent_for, now):
+    # (дата повторення, due_at) найближчого ще не нагаданого повторення, яке не минуло; або (None, None)
+    if event.start_date is None:
+        return None, None
+    recurrence = getattr(event, 'recurrence', None)
+    from_date = timezone.localdate(now)
+    if recurrence is not None and sent_for is not None:
+        from_date = max(from_date, sent_for + timedelta(days=1))
+    while True:
+        if recurrence is None:
+            # перенесена звичайна подія отримує нове нагадування
+            day = event.start_date
+            if event.completed or day == sent_for or day < from_date:
+                return None, None
+        else:
+            day = next_date(event.start_date, recurrence.freq, recurrence.interval, recurrence.ends_on,
+                            recurrence.exdates, from_date)
+            if day is None:
+                return None, None
+        occurs_at = _occurs_at(day, event.start_time)
+        if occurs_at > now:
+            return day, occurs_at - timedelta(minutes=settings.CALENDAR_REMINDER_LEAD_MINUTES)
+        if recurrence is None:
+            return None, None
+        from_date = day + timedelta(days=1)
+
+
+def schedule_reminders(event_ids):
+    # Перераховує наступне нагадування подій; викликається після коміту змін події чи серії.
+    # Наявні рядки блокуються, щоб не перезаписати sent_for воркера, який саме надсилає нагадування
+    now = timezone.now()
+    with transaction.atomic():
+        sent_for = dict(
+            EventReminder.objects.filter(event_id__in=event_ids).order_by('pk').select_for_update()
+            .values_list('event_id', 'sent_for')
+        )
+        reminders = []
+        for event in CalendarEvent.objects.filter(id__in=event_ids).select_related('recurrence'):
+            day, due_at = next_reminder(event, sent_for.get(event.id), now)
+            if day is None and event.id not in sent_for:
+                continue
+            reminders.append(EventReminder(event=event, occurrence_date=day, due_at=due_at))
+        EventReminder.objects.bulk_create(
+            reminders, update_conflicts=True, unique_fields=['event'],
+            update_fields=['occurrence_date', 'due_at', 'attempts', 'last_error']
+        )
+
+
+def dispatch_due_reminders(notifier, batch_size=None, now=None):
+    # Один батч без блокувань на час надсилання. Коротка транзакція з SKIP LOCKED бере рядки в оренду:
+    # due_at зсувається на CALENDAR_REMINDER_LEASE_SECONDS, тож інші воркери їх не бачать, а після падіння
+    # воркера батч буде взято знову (at-least-once). Результат фіксується другою короткою транзакцією
+    now = now or timezone.now()
+    batch_size = batch_size or settings.CALENDAR_REMINDER_BATCH_SIZE
+    lease_until = now + timedelta(seconds=settings.CALENDAR_REMINDER_LEASE_SECONDS)
+    with transaction.atomic():
+        reminders = list(
+            EventReminder.objects.filter(due_at__lte=now).order_by('due_at')
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('event__pet__user', 'event__recurrence')[:batch_size]
+        )
+        if not reminders:
+            return 0
+        EventReminder.objects.filter(pk__in=[reminder.pk for reminder in reminders]).update(due_at=lease_until)
+
+    completed = set(EventOccurrenceOverride.objects.filter(
+        event_id__in=[reminder.event_id for reminder in reminders],
+        occurrence_date__in={reminder.occurrence_date for reminder in reminders},
+        completed=True,
+    ).values_list('event_id', 'occurrence_date'))
+    pending = [r for r in reminders if (r.event_id, r.occurrence_date) not in completed]
+    errors = dict(zip((r.pk for r in pending), notifier.send_many(pending)))
+
+    with transaction.atomic():
+        # поки йшли листи, schedule_reminders міг переписати рядок зміненої події - його стан новіший
+        leased = set(
+            EventReminder.objects.filter(pk__in=[reminder.pk for reminder in reminders], due_at=lease_until)
+            .select_for_update().values_list('pk', 'occurrence_date')
+        )
+        finished = [reminder for reminder in reminders if (reminder.pk, reminder.occurrence_date) in leased]
+        for reminder in finished:
+            error = errors.get(reminder.pk)
+            if error is not None and reminder.attempts + 1 < settings.CALENDAR_REMINDER_MAX_ATTEMPTS:
+                reminder.attempts += 1
+                reminder.last_error = str(error)[:1000]
+                reminder.due_at = now + timedelta(minutes=2 ** reminder.attempts)
+                continue
+            if error is not None:
+                logger.warning('Giving up reminder %s for %s: %s', reminder.pk, reminder.occurrence_date, error)
+                reminder.last_error = str(error)[:1000]
+            else:
+                reminder.last_error = ''
+                if reminder.pk in errors:
+                    reminder.sent_at = now
+            reminder.attempts = 0
+            reminder.sent_for = reminder.occurrence_date
+            try:
+                reminder.occurrence_date, reminder.due_at = next_reminder(reminder.event, reminder.sent_for, now)
+            except Exception as exc:
+                # лист уже пішов: зламана подія не має відкотити позначки інших рядків батчу
+                logger.exception('Cannot schedule the next reminder %s', reminder.pk)
+                reminder.occurrence_date = reminder.due_at = None
+                reminder.last_error = str(exc)[:1000]
+        EventReminder.objects.bulk_update(
+            finished, ['occurrence_date', 'due_at', 'sent_for', 'sent_at', 'attempts', 'last_error']
+        )
+    return len(reminders)
+
+
+class EmailReminderNotifier:
+    # Листи батчу йдуть одним з'єднанням EMAIL_BACKEND; помилка одного листа не зупиняє інших.
+    # send_many повертає по помилці (або None) на кожне нагадування
+
+    def send_many(self, reminders):
+        errors = []
+        with mail.get_connection() as connection:
+            for reminder in reminders:
+                try:
+                    connection.send_messages([self.build_message(reminder)])
+                except Exception as exc:
+                    errors.append(exc)
+                else:
+                    errors.append(None)
+        return errors
+
+    def build_message(self, reminder):
+        event = reminder.event
+        when = reminder.occurrence_date.strftime('%d.%m.%Y')
+        if event.start_time:
+            when += f' о {event.start_time:%H:%M}'
+        return mail.EmailMessage(
+            subject=f'Нагадування: {event.event_title}',
+            body=f'{event.pet.pet_name}: {event.event_title} - {when}.\n\n{event.description or ""}'.rstrip(),
+            to=[event.pet.user.email],
+        )
+
+
+def get_notifier():
+    return import_string(settings.CALENDAR_REMINDER_NOTIFIER)()
@@ -0,0 +1,55 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.renderers import BaseRenderer
+
+from .profiling import span
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # datetime/date/UUID кодуються нативно (UTC як 'Z', як у полях DRF); решта - через DjangoJSONEncoder
+    _ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value):
+    return DjangoJSONEncoder().default(value)
+
+
+def dumps(data):
+    with span('serialize'):
+        if orjson is not None:
+            return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+        return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+class FastJsonResponse(HttpResponse):
+    # Заміна JsonResponse з тим самим інтерфейсом (data, safe), але з orjson
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError('In order to allow non-dict objects to be serialized set the safe parameter to False.')
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
+
+
+class EnvelopeResponse(FastJsonResponse):
+    # {"payloadType": ..., "payload": ...} + додаткові ключі верхнього рівня (наприклад, next)
+
+    def __init__(self, payload_type, payload, status=200, **extra):
+        super().__init__({'payloadType': payload_type, 'payload': payload, **extra}, status=status)
+
+
+class FastJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
@@ -0,0 +1,67 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+from django.utils.html import escape
+
+# Має збігатися з конфігурацією тригера в міграції 0024
+SEARCH_CONFIG = 'simple'
+
+
+def _fts5_query(text):
+    # Кожне слово - окремий рядковий токен FTS5 (неявний AND), щоб лапки й оператори
+    # з пошукового рядка не ламали синтаксис MATCH
+    return ' '.join('"{}"'.format(word.replace('"', '""')) for word in text.split())
+
+
+def search_journal(queryset, text):
+    text = text.strip()
+    if not text:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return queryset.filter(search_vector=SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch'))
+    if vendor == 'sqlite':
+        return queryset.filter(id__in=RawSQL(
+            'SELECT rowid FROM journal_entries_fts WHERE journal_entries_fts MATCH %s', [_fts5_query(text)]
+        ))
+    words = Q()
+    for word in text.split():
+        words &= Q(entry_title__icontains=word) | Q(description__icontains=word)
+    return queryset.filter(words)
+
+
+def search_forum(queryset, field, text):
+    # Кожне слово - ILIKE '%слово%', який у PostgreSQL обслуговує GIN-індекс gin_trgm_ops.
+    # rank - схожість із запитом (float8, щоб курсор точно відтворював значення);
+    # в інших БД ранжування немає і результати йдуть від новіших
+    words = Q()
+    for word in text.split():
+        words &= Q(**{f'{field}__icontains': word})
+    if connections[queryset.db].vendor == 'postgresql':
+        rank = Cast(TrigramWordSimilarity(text, field), FloatField())
+    else:
+        rank = Value(0.0, output_field=FloatField())
+    return queryset.filter(words).annotate(rank=rank)
+
+
+def highlight(text, query, radius=80):
+    # Фрагмент навколо першого збігу; текст екранується, збіги обгортаються в <mark>
+    words = sorted(set(query.split()), key=len, reverse=True)
+    if not text or not words:
+        return escape(text or '')
+    pattern = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+    match = pattern.search(text)
+    start = max(0, match.start() - radius) if match else 0
+    end = min(len(text), (match.end() if match else 0) + radius)
+    fragment = text[start:end]
+    parts, last = [], 0
+    for found in pattern.finditer(fragment):
+        parts.append(escape(fragment[last:found.start()]))
+        parts.append(f'<mark>{escape(found.group())}</mark>')
+        last = found.end()
+    parts.append(escape(fragment[last:]))
+    return ('…' if start else '') + ''.join(parts) + ('…' if end < len(text) else '')
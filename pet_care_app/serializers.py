@@ -1,10 +1,11 @@
-import uuid
-import boto3
-from botocore.config import Config
+from functools import partial
+
 from django.conf import settings
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 from .models import *
+from .recurrence import runs_past_date_max
+from .uploads import pending_photo, schedule_photo_upload
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -17,7 +18,8 @@ class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
-        fields = ['full_name', 'email', 'photo_url', 'password']
+        fields = ['full_name', 'email', 'photo_url', 'photo_status', 'photo_variants', 'password']
+        read_only_fields = ['photo_status', 'photo_variants']
 
 
 class SignUpSerializer(serializers.Serializer):
@@ -30,32 +32,21 @@ class SignUpSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         photo = validated_data.pop("photo", None)
+        password_hash = validated_data.pop("password_hash", None)
         user = User(
             full_name=validated_data["full_name"],
-            email=validated_data["email"]
+            email=validated_data["email"],
+            **(pending_photo() if photo else {})
         )
-        user.set_password(validated_data["password"])
+        if password_hash:
+            # Вже захешовано поза потоком запиту (SignUpView)
+            user.password = password_hash
+        else:
+            user.set_password(validated_data["password"])
         user.save()
 
         if photo:
-            s3 = boto3.client(
-                "s3",
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_S3_REGION_NAME,
-                config=Config(s3={'use_accelerate_endpoint': True})
-            )
-            key = f"user_profile/image_{user.id}_{uuid.uuid4().hex}.jpg"
-            s3.upload_fileobj(
-                photo.file,
-                settings.AWS_STORAGE_BUCKET_NAME,
-                key
-            )
-            user.photo_url = (
-                f"https://{settings.AWS_STORAGE_BUCKET_NAME}"
-                f".s3.{settings.AWS_S3_REGION_NAME}.amazonaws.com/{key}"
-            )
-            user.save()
+            schedule_photo_upload(user, photo, f"user_profile/user_{user.id}")
         return user
 
 
@@ -65,41 +56,147 @@ class PetSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Pet
-        fields = ['id', 'pet_name', 'breed', 'sex', 'birthday', 'photo_url', 'photo']
-        read_only_fields = ['id', 'photo_url']
-
-    def _upload_to_s3(self, file_obj, prefix: str):
-        client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME
-        )
-        key = f"{prefix}/image_{uuid.uuid4().hex}"
-        client.upload_fileobj(file_obj, settings.AWS_STORAGE_BUCKET_NAME, key)
-        return f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3-accelerate.amazonaws.com/{key}"
+        fields = ['id', 'pet_name', 'breed', 'sex', 'birthday', 'photo_url', 'photo_status', 'photo_variants', 'photo']
+        read_only_fields = ['id', 'photo_url', 'photo_status', 'photo_variants']
 
     def create(self, validated_data):
         photo = validated_data.pop('photo', None)
-        pet = Pet.objects.create(**validated_data)
+        pet = Pet.objects.create(**validated_data, **(pending_photo() if photo else {}))
         if photo:
-            pet.photo_url = self._upload_to_s3(photo.file, f"pet_photos/pet_{pet.id}")
-            pet.save()
+            schedule_photo_upload(
+                pet, photo, f"pet_photos/pet_{pet.id}",
+                on_done=partial(CollectionVersion.bump, pet.user_id, 'pets')
+            )
         return pet
 
     def update(self, instance, validated_data):
         photo = validated_data.pop('photo', None)
+        if photo:
+            validated_data.update(pending_photo())
         instance = super().update(instance, validated_data)
         if photo:
-            instance.photo_url = self._upload_to_s3(photo.file, f"pet_photos/pet_{instance.id}")
-            instance.save()
+            schedule_photo_upload(
+                instance, photo, f"pet_photos/pet_{instance.id}",
+                on_done=partial(CollectionVersion.bump, instance.user_id, 'pets')
+            )
         return instance
 
 
+class EventRecurrenceSerializer(serializers.ModelSerializer):
+    exdates = serializers.ListField(child=serializers.DateField(), required=False)
+
+    class Meta:
+        model = EventRecurrence
+        fields = ['freq', 'interval', 'until', 'count', 'exdates', 'ends_on']
+        read_only_fields = ['ends_on']
+
+    def validate_interval(self, value):
+        if not 1 <= value <= settings.CALENDAR_RECURRENCE_MAX_INTERVAL:
+            raise serializers.ValidationError(f'Must be between 1 and {settings.CALENDAR_RECURRENCE_MAX_INTERVAL}.')
+        return value
+
+    def validate_count(self, value):
+        if value is not None and not 1 <= value <= settings.CALENDAR_RECURRENCE_MAX_COUNT:
+            raise serializers.ValidationError(f'Must be between 1 and {settings.CALENDAR_RECURRENCE_MAX_COUNT}.')
+        return value
+
+    def validate_exdates(self, value):
+        return sorted({day.isoformat() for day in value})
+
+    def validate(self, attrs):
+        if attrs.get('until') and attrs.get('count'):
+            raise serializers.ValidationError('Use either until or count, not both.')
+        return attrs
+
+
+def series_rule(current, changes):
+    # Правило серії після змін: update() переносить у наявний EventRecurrence лише передані поля
+    rule = {'interval': 1, 'count': None, 'until': None}
+    if current is not None:
+        rule.update(freq=current.freq, interval=current.interval, count=current.count, until=current.until)
+    rule.update(changes)
+    return rule
+
+
+def validate_series(rule, start_date):
+    if not start_date:
+        raise serializers.ValidationError({'start_date': 'Recurring events need a start date.'})
+    if rule['until'] and rule['until'] < start_date:
+        raise serializers.ValidationError({'recurrence': {'until': 'Must not be before start_date.'}})
+    if runs_past_date_max(start_date, rule['freq'], rule['interval'], rule['count'], rule['until']):
+        raise serializers.ValidationError({'recurrence': 'The series runs past the last supported date.'})
+
+
 class CalendarEventSerializer(serializers.ModelSerializer):
+    recurrence = EventRecurrenceSerializer(required=False, allow_null=True)
+
     class Meta:
         model = CalendarEvent
-        fields = ['id', 'pet', 'event_type', 'event_title', 'start_date', 'start_time', 'description', 'completed']
+        fields = ['id', 'pet', 'event_type', 'event_title', 'start_date', 'start_time', 'description', 'completed',
+                  'recurrence']
+
+    def validate(self, attrs):
+        current = getattr(self.instance, 'recurrence', None)
+        changes = attrs.get('recurrence', {})
+        if changes is None or (current is None and not changes):
+            return attrs
+        if current is None and 'freq' not in changes:
+            raise serializers.ValidationError({'recurrence': {'freq': 'This field is required.'}})
+        start_date = attrs.get('start_date', getattr(self.instance, 'start_date', None))
+        validate_series(series_rule(current, changes), start_date)
+        return attrs
+
+    def create(self, validated_data):
+        recurrence = validated_data.pop('recurrence', None)
+        event = super().create(validated_data)
+        if recurrence:
+            EventRecurrence.objects.create(event=event, **recurrence)
+        return event
+
+    def update(self, instance, validated_data):
+        replace = 'recurrence' in validated_data
+        recurrence = validated_data.pop('recurrence', None)
+        instance = super().update(instance, validated_data)
+        current = getattr(instance, 'recurrence', None)
+        if replace and recurrence is None:
+            if current is not None:
+                current.delete()
+                CalendarEvent.recurrence.related.delete_cached_value(instance)
+        elif replace:
+            current = current or EventRecurrence(event=instance)
+            for field, value in recurrence.items():
+                setattr(current, field, value)
+            current.save()
+        elif current is not None and 'start_date' in validated_data:
+            # ends_on залежить від start_date
+            current.save()
+        return instance
+
+
+class CalendarEventBulkItemSerializer(serializers.ModelSerializer):
+    # pet як простий id: власність усіх тварин батчу перевіряється одним запитом у view
+    id = serializers.IntegerField(read_only=True)
+    pet = serializers.IntegerField(source='pet_id')
+    # серію батч не змінює, але віддає її, як CalendarDto
+    recurrence = EventRecurrenceSerializer(read_only=True)
+
+    class Meta:
+        model = CalendarEvent
+        fields = ['id', 'pet', 'event_type', 'event_title', 'start_date', 'start_time', 'description', 'completed',
+                  'recurrence']
+
+    def validate(self, attrs):
+        current = getattr(self.instance, 'recurrence', None)
+        if current is not None:
+            validate_series(series_rule(current, {}), attrs.get('start_date', self.instance.start_date))
+        return attrs
+
+
+class EventOccurrenceOverrideSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EventOccurrenceOverride
+        fields = ['event', 'occurrence_date', 'completed']
+        read_only_fields = ['event', 'occurrence_date']
 
 
 class JournalEntrySerializer(serializers.ModelSerializer):
@@ -129,46 +226,43 @@ class ForumCommentSerializer(serializers.ModelSerializer):
 class ForumPostSerializer(serializers.ModelSerializer):
     user_full = serializers.ReadOnlyField(source='user.full_name')
     user_photo = serializers.ReadOnlyField(source='user.photo_url')
-    likes_count = serializers.SerializerMethodField()
+    user_photo_variants = serializers.ReadOnlyField(source='user.photo_variants')
     has_liked = serializers.SerializerMethodField()
-    comments = ForumCommentSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
     post_text = serializers.CharField(allow_blank=True, required=False)
     photo = serializers.ImageField(write_only=True, required=False)
 
     class Meta:
         model = ForumPost
         fields = [
-            'id', 'user_full', 'user_photo', 'post_text', 'post_text', 'photo_url', 'photo', 'created_at',
-            'likes_count', 'has_liked', 'comments'
+            'id', 'user_full', 'user_photo', 'user_photo_variants', 'post_text', 'post_text', 'photo_url',
+            'photo_status', 'photo_variants', 'photo', 'created_at',
+            'likes_count', 'has_liked', 'comments_count', 'comments'
         ]
-
-    def _upload_to_s3(self, file_obj, prefix: str):
-        client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME,
-            config=Config(s3={'use_accelerate_endpoint': True})
-        )
-        key = f"{prefix}/image_{uuid.uuid4().hex}"
-        client.upload_fileobj(file_obj, settings.AWS_STORAGE_BUCKET_NAME, key)
-        return f"https://{settings.AWS_STORAGE_BUCKET_NAME}.s3-accelerate.amazonaws.com/{key}"
+        read_only_fields = ['photo_status', 'photo_variants', 'likes_count', 'comments_count']
 
     def create(self, validated_data):
         photo = validated_data.pop('photo', None)
+        if photo:
+            validated_data.update(pending_photo())
         post = super().create(validated_data)
         if photo:
-            post.photo_url = self._upload_to_s3(photo.file, f"forum_posts/post_{post.id}")
-            post.save()
+            schedule_photo_upload(post, photo, f"forum_posts/post_{post.id}")
         return post
 
-    def get_likes_count(self, obj):
-        return obj.likes.count()
-
     def get_has_liked(self, obj):
+        if hasattr(obj, 'has_liked'):
+            return obj.has_liked
         user = self.context['request'].user
         return user.is_authenticated and obj.likes.filter(user=user).exists()
 
+    def get_comments(self, obj):
+        # Лише останні коментарі; повний список - через ForumCommentView
+        latest = getattr(obj, 'latest_comments', None)
+        if latest is None:
+            latest = obj.comments.select_related('user').order_by('-created_at', '-id')[:settings.FORUM_FEED_COMMENT_PREVIEW]
+        return ForumCommentSerializer(reversed(list(latest)), many=True).data
+
 
 class PartnerWatchlistSerializer(serializers.ModelSerializer):
     partner_id = serializers.IntegerField(source='partner.id')
@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import invalidate_partner_catalog
+from .models import CalendarEvent, EventRecurrence, SitePartner
+from .reminders import schedule_reminders
+
+
+@receiver([post_save, post_delete], sender=SitePartner)
+def site_partner_changed(sender, **kwargs):
+    # Після коміту, щоб паралельний запит не закешував старі дані знову
+    transaction.on_commit(invalidate_partner_catalog)
+
+
+@receiver(post_save, sender=CalendarEvent)
+@receiver([post_save, post_delete], sender=EventRecurrence)
+def calendar_event_changed(sender, instance, **kwargs):
+    # bulk_create/bulk_update сигналів не шлють - CalendarEventBulkView планує нагадування сам
+    event_id = instance.pk if sender is CalendarEvent else instance.event_id
+    # robust: запис уже закомічено, помилка планування лише логується, а не стає 500
+    transaction.on_commit(lambda: schedule_reminders([event_id]), robust=True)
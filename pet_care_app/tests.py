@@ -1,3 +1,1039 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import json
+import tempfile
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import OperationalError, connection
+from django.db.models import F
+from django.test import AsyncClient, TestCase, override_settings
+from PIL import Image
+from django.urls import get_resolver, resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .async_views import PetListView
+from .authentication import user_cache
+from .management.commands.run_benchmarks import Command as RunBenchmarksCommand
+from .db_pool import PoolTimeout
+from .fast_serializers import calendar_event_values, journal_entry_values, pet_values, site_partner_values
+from . import uploads
+from .hashing import HashingBusy, PasswordHashingExecutor
+from .profiling import QueryBudgetExceeded, RequestProfile
+from .recurrence import last_occurrence
+from .reminders import dispatch_due_reminders, get_notifier, schedule_reminders
+from .responses import EnvelopeResponse, dumps
+from .models import *
+from .serializers import CalendarEventSerializer, JournalEntrySerializer, PetSerializer, SitePartnerSerializer
+from .views import MyRefreshToken
+
+
+def api_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {MyRefreshToken.for_user(user).access_token}')
+    user_cache.set(user)
+    return client
+
+
+def make_photo(name='photo.jpg', size=(64, 48), orientation=None):
+    buffer = BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    Image.new('RGB', size, 'orange').save(buffer, 'JPEG', exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class ForumFeedTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.other = User.objects.create_user(email='other@example.com', password='pass', full_name='Other')
+        self.client = api_client(self.user)
+
+    def _create_posts(self, count):
+        for i in range(count):
+            post = ForumPost.objects.create(user=self.other, post_text=f'post {i}', comments_count=2, likes_count=1)
+            ForumComment.objects.create(forum_post=post, user=self.user, comment_text='hi')
+            ForumComment.objects.create(forum_post=post, user=self.other, comment_text='hello')
+            ForumLike.objects.create(forum_post=post, user=self.user)
+
+    def _get_feed(self, **params):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('forum-post-list'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_feed_query_count_does_not_grow_with_posts(self):
+        self._create_posts(2)
+        self.assertEqual(len(self._get_feed()['results']), 2)
+        self._create_posts(10)
+        self.assertEqual(len(self._get_feed()['results']), 12)
+
+    def test_feed_reads_annotated_counters(self):
+        self._create_posts(1)
+        post = self._get_feed()['results'][0]
+        self.assertEqual(post['likes_count'], 1)
+        self.assertTrue(post['has_liked'])
+        self.assertEqual([c['user_full'] for c in post['comments']], ['Owner', 'Other'])
+
+    def test_feed_cursor_walks_every_post_once(self):
+        self._create_posts(5)
+        seen = []
+        page = self._get_feed(page_size=2)
+        while True:
+            seen.extend(post['id'] for post in page['results'])
+            if not page['next']:
+                break
+            page = self._get_feed(page_size=2, cursor=page['next'])
+        expected = list(ForumPost.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_feed_rejects_malformed_cursor(self):
+        response = self.client.get(reverse('forum-post-list'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_tampered_cursor_values_are_400(self):
+        post = ForumPost.objects.create(user=self.user, post_text='Hello')
+        for values in (['zzz', 1], ['2025-01-01T00:00:00+00:00', 'x'], [{}, []]):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            for url in (reverse('journal-list'), reverse('forum-post-list'), reverse('forum-comments', args=[post.id])):
+                response = self.client.get(url, {'cursor': cursor})
+                self.assertEqual((response.status_code, response.json()), (400, {'cursor': 'Invalid cursor.'}), url)
+
+
+class ForumSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        for i in range(3):
+            ForumPost.objects.create(user=self.user, post_text=f'Best dry food for a senior dog, take {i}')
+        post = ForumPost.objects.create(user=self.user, post_text='Cat <b>litter</b> tips')
+        ForumComment.objects.create(forum_post=post, user=self.user, comment_text='Try a dog food brand')
+
+    def _search(self, **params):
+        return self.client.get(reverse('forum-search'), params)
+
+    def test_paginated_results_with_highlighted_snippets(self):
+        with self.assertNumQueries(1):
+            first = self._search(q='dog food', page_size=2).json()
+        second = self._search(q='dog food', page_size=2, cursor=first['next']).json()
+        self.assertIsNone(second['next'])
+        self.assertEqual(len(first['results']) + len(second['results']), 3)
+        self.assertIn('<mark>dog</mark>', first['results'][0]['snippet'])
+        self.assertIn('<mark>food</mark>', first['results'][0]['snippet'])
+
+        comment = self._search(q='DOG', scope='comments').json()['results']
+        self.assertEqual(len(comment), 1)
+        self.assertEqual(comment[0]['snippet'], 'Try a <mark>dog</mark> food brand')
+        self.assertIn('&lt;b&gt;<mark>litter</mark>', self._search(q='litter').json()['results'][0]['snippet'])
+
+    def test_short_query_and_unknown_scope_are_rejected(self):
+        self.assertEqual(self._search(q='do').status_code, 400)
+        self.assertEqual(self._search(q='ab c d').status_code, 400)
+        # короткі слова відкидаються: 'a' не звужує результат і не підсвічується
+        results = self._search(q='a dog').json()['results']
+        self.assertEqual(len(results), 3)
+        self.assertNotIn('<mark>a</mark>', results[0]['snippet'])
+        self.assertEqual(self._search(q='dog', scope='users').status_code, 400)
+
+
+class ForumCommentTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.post = ForumPost.objects.create(user=self.user, post_text='post')
+        self.client = api_client(self.user)
+        self.url = reverse('forum-comments', args=[self.post.id])
+
+    def test_posting_comment_maintains_counter(self):
+        for i in range(3):
+            response = self.client.post(self.url, {'comment_text': f'comment {i}'})
+            self.assertEqual(response.status_code, 201)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 3)
+
+    def test_comments_are_paginated_in_order(self):
+        for i in range(5):
+            self.client.post(self.url, {'comment_text': f'comment {i}'})
+        texts = []
+        params = {'page_size': 2}
+        while True:
+            with self.assertNumQueries(1):
+                page = self.client.get(self.url, params).json()
+            texts.extend(c['comment_text'] for c in page['results'])
+            if not page['next']:
+                break
+            params['cursor'] = page['next']
+        self.assertEqual(texts, [f'comment {i}' for i in range(5)])
+
+
+class ForumLikeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.post = ForumPost.objects.create(user=self.user, post_text='post')
+        self.client = api_client(self.user)
+        self.url = reverse('forum-like', args=[self.post.id])
+
+    def test_toggle_updates_counter_without_counting_likes(self):
+        with self.assertNumQueries(4):  # SAVEPOINT, INSERT, UPDATE, RELEASE
+            response = self.client.post(self.url)
+        self.assertEqual(response.json(), {'liked': True, 'likes_count': 1})
+        response = self.client.post(self.url)
+        self.assertEqual(response.json(), {'liked': False, 'likes_count': 0})
+        self.assertFalse(ForumLike.objects.exists())
+
+    @skipUnless(connection.vendor == 'postgresql', 'DELETE inside a CTE needs PostgreSQL')
+    def test_unlike_is_two_statements(self):
+        self.client.post(self.url)
+        with self.assertNumQueries(4):  # SAVEPOINT, INSERT, DELETE+UPDATE, RELEASE
+            response = self.client.post(self.url)
+        self.assertEqual(response.json(), {'liked': False, 'likes_count': 0})
+
+    def test_like_of_missing_post_is_404(self):
+        response = self.client.post(reverse('forum-like', args=[self.post.id + 1]))
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(ForumLike.objects.exists())
+
+    def test_reconcile_command_fixes_drifted_counters(self):
+        ForumLike.objects.create(user=self.user, forum_post=self.post)
+        ForumPost.objects.filter(pk=self.post.pk).update(likes_count=7, comments_count=3)
+        call_command('reconcile_forum_counters', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.comments_count), (1, 0))
+
+
+class SitePartnerCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = api_client(User.objects.create_user(email='o@example.com', password='pass', full_name='O'))
+        SitePartner.objects.create(site_name='Vet', site_url='https://vet.example', partner_type='CLINIC', rating=4.5)
+        SitePartner.objects.create(site_name='Shop', site_url='https://shop.example', rating=3.0)
+
+    def test_cached_catalog_revalidates_without_queries(self):
+        response = self.client.get(reverse('partners-list'))
+        self.assertEqual([p['site_name'] for p in response.json()], ['Vet', 'Shop'])
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse('partners-list'))
+            not_modified = self.client.get(reverse('partners-list'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertIn('Last-Modified', not_modified)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    def test_catalog_served_without_a_working_cache(self):
+        response = self.client.get(reverse('partners-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['site_name'] for p in response.json()], ['Vet', 'Shop'])
+
+    def test_save_invalidates_catalog(self):
+        etag = self.client.get(reverse('partners-list'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            SitePartner.objects.create(site_name='Groom', site_url='https://groom.example', partner_type='GROOMING_SALON')
+        response = self.client.get(reverse('partners-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 3)
+
+    def test_filter_and_ordering(self):
+        response = self.client.get(reverse('partners-list'), {'ordering': 'rating'})
+        self.assertEqual([p['site_name'] for p in response.json()], ['Shop', 'Vet'])
+        response = self.client.get(reverse('partners-list'), {'partner_type': 'CLINIC'})
+        self.assertEqual([p['site_name'] for p in response.json()], ['Vet'])
+        self.assertEqual(self.client.get(reverse('partners-list'), {'partner_type': 'ZOO'}).status_code, 400)
+
+
+class CollectionVersionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+        self.pet = Pet.objects.create(user=self.user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01')
+
+    def test_unchanged_list_returns_304_with_one_query(self):
+        etag = self.client.get(reverse('pets-list'))['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('pets-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        other_month = self.client.get(reverse('calendar-list'), {'year': 2020, 'month': 1})
+        self.assertNotEqual(other_month['ETag'], self.client.get(reverse('calendar-list'))['ETag'])
+
+    def test_writes_bump_collection_version(self):
+        pets_etag = self.client.get(reverse('pets-list'))['ETag']
+        journal_etag = self.client.get(reverse('journal-list'))['ETag']
+        created = self.client.post(reverse('journal-list'), {
+            'pet': self.pet.id, 'entry_type': 'TRAINING', 'entry_title': 'Walk', 'description': 'Park'
+        })
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(self.client.get(reverse('journal-list'), HTTP_IF_NONE_MATCH=journal_etag).status_code, 200)
+        self.assertEqual(self.client.get(reverse('pets-list'), HTTP_IF_NONE_MATCH=pets_etag).status_code, 304)
+
+        self.client.delete(reverse('pets-detail', args=[self.pet.id]))
+        self.assertEqual(self.client.get(reverse('pets-list'), HTTP_IF_NONE_MATCH=pets_etag).status_code, 200)
+        versions = dict(CollectionVersion.objects.filter(user=self.user).values_list('collection', 'version'))
+        self.assertEqual(versions, {'pets': 1, 'calendar': 1, 'journal': 2})
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+        self.pet = Pet.objects.create(user=self.user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01')
+
+    def test_read_only_views_reject_writes_with_405(self):
+        for url in (reverse('partners-list'), reverse('forum-search'), reverse('profile-export'),
+                    reverse('pets-timeline', args=[self.pet.id])):
+            self.assertEqual(self.client.post(url, {}, format='json').status_code, 405, url)
+            self.assertEqual(self.client.delete(url).status_code, 405, url)
+            self.assertEqual(self.client.options(url)['Allow'], 'GET, HEAD, OPTIONS', url)
+        self.assertEqual(self.client.options(reverse('pets-list'))['Allow'], 'GET, POST, HEAD, OPTIONS')
+        self.assertEqual(self.client.put(reverse('pets-list'), {}, format='json').status_code, 405)
+
+    def test_malformed_calendar_month_is_400(self):
+        for params in ({'year': 'abc'}, {'month': ''}, {'year': 2025, 'month': 'x'}):
+            self.assertEqual(self.client.get(reverse('calendar-list'), params).status_code, 400, params)
+
+
+class CalendarMonthFilterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+        self.rex = Pet.objects.create(user=self.user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01')
+        self.tom = Pet.objects.create(user=self.user, pet_name='Tom', breed='Cat', sex='MALE', birthday='2020-01-01')
+        stranger = User.objects.create_user(email='stranger@example.com', password='pass', full_name='Stranger')
+        foreign = Pet.objects.create(user=stranger, pet_name='Max', breed='Mixed', sex='MALE', birthday='2020-01-01')
+        CalendarEvent.objects.bulk_create([
+            CalendarEvent(pet=self.rex, event_title='Before', start_date='2025-02-28'),
+            CalendarEvent(pet=self.rex, event_title='First', start_date='2025-03-01', start_time='09:00'),
+            CalendarEvent(pet=self.tom, event_title='Tom', start_date='2025-03-15'),
+            CalendarEvent(pet=self.rex, event_title='Last', start_date='2025-03-31'),
+            CalendarEvent(pet=self.rex, event_title='After', start_date='2025-04-01'),
+            CalendarEvent(pet=foreign, event_title='Foreign', start_date='2025-03-10'),
+        ])
+
+    def _titles(self, **params):
+        response = self.client.get(reverse('calendar-list'), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [item['event_title'] for item in response.json()['payload']]
+
+    def test_month_range_and_pet_filter(self):
+        self.assertEqual(self._titles(year=2025, month=3), ['First', 'Tom', 'Last'])
+        self.assertEqual(self._titles(year=2025, month=3, pet=self.rex.id), ['First', 'Last'])
+        self.assertEqual(self._titles(year=2024, month=12), [])
+
+    def test_out_of_range_month_or_year_is_400(self):
+        for params in ({'month': 13}, {'month': 0}, {'year': 9999, 'month': 12}, {'year': 0}, {'pet': 'abc'}):
+            self.assertEqual(self.client.get(reverse('calendar-list'), params).status_code, 400, params)
+
+    def test_per_pet_composite_indexes_exist(self):
+        expected = {
+            'Calendar_events': ['pet_id', 'start_date', 'start_time'],
+            'Journal_entries': ['pet_id', 'created_at'],
+            'Forum_comments': ['forum_post_id', 'created_at', 'id'],
+        }
+        with connection.cursor() as cursor:
+            for table, columns in expected.items():
+                indexes = connection.introspection.get_constraints(cursor, table).values()
+                self.assertIn(columns, [index['columns'] for index in indexes if index['index']], table)
+
+
+class RecurringEventTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+        self.pet = Pet.objects.create(user=self.user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01')
+
+    def _create(self, start_date, recurrence):
+        response = self.client.post(reverse('calendar-list'), {
+            'pet': self.pet.id, 'event_type': 'FLEA_CTRL', 'event_title': 'Flea drops',
+            'start_date': start_date, 'recurrence': recurrence,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()['payload']
+
+    def _month(self, year, month):
+        response = self.client.get(reverse('calendar-list'), {'year': year, 'month': month})
+        return [(item['start_date'], item['completed']) for item in response.json()['payload']]
+
+    def test_series_is_expanded_only_for_requested_month(self):
+        self._create('2025-01-06', {'freq': 'WEEKLY', 'interval': 2, 'count': 5})
+        CalendarEvent.objects.create(pet=self.pet, event_title='Checkup', start_date='2025-02-14')
+        # версія колекції + події місяця + overrides вікна
+        with self.assertNumQueries(3):
+            february = self._month(2025, 2)
+        self.assertEqual(february, [('2025-02-03', False), ('2025-02-14', False), ('2025-02-17', False)])
+        self.assertEqual(self._month(2025, 3), [('2025-03-03', False)])
+        self.assertEqual(self._month(2025, 4), [])
+
+    def test_occurrence_overrides_and_exceptions(self):
+        event = self._create('2025-01-31', {'freq': 'MONTHLY', 'until': '2025-12-31'})
+        self.assertEqual(self._month(2025, 2), [])
+        url = reverse('calendar-occurrence', args=[event['id'], '2025-03-31'])
+        self.assertEqual(self.client.patch(url, {'completed': True}, format='json').status_code, 200)
+        self.assertEqual(self._month(2025, 3), [('2025-03-31', True)])
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self._month(2025, 3), [])
+        missing = reverse('calendar-occurrence', args=[event['id'], '2025-04-30'])
+        self.assertEqual(self.client.patch(missing, {'completed': True}, format='json').status_code, 404)
+        self.assertEqual(EventRecurrence.objects.get(event_id=event['id']).exdates, ['2025-03-31'])
+
+    def test_series_past_date_max_is_rejected(self):
+        for start_date, recurrence in (('2025-01-01', {'freq': 'YEARLY', 'interval': 10, 'count': 1000}),
+                                       ('2025-01-01', {'freq': 'WEEKLY', 'interval': 1000, 'count': 1000}),
+                                       ('2025-01-01', {'freq': 'DAILY', 'interval': 10000000, 'count': 10}),
+                                       ('9500-01-01', {'freq': 'YEARLY', 'interval': 1000})):
+            response = self.client.post(reverse('calendar-list'), {
+                'pet': self.pet.id, 'event_title': 'Far', 'start_date': start_date, 'recurrence': recurrence,
+            }, format='json')
+            self.assertEqual(response.status_code, 400, recurrence)
+        self.assertFalse(CalendarEvent.objects.exists())
+
+    def test_stored_series_beyond_date_max_ends_quietly(self):
+        event = CalendarEvent.objects.create(pet=self.pet, event_title='Legacy', start_date='2025-06-01')
+        EventRecurrence.objects.create(event=event, freq='YEARLY', interval=30000)
+        self.assertEqual(self._month(2025, 6), [('2025-06-01', False)])
+        self.assertEqual(self._month(9998, 6), [])
+        self.assertEqual(last_occurrence(date(9999, 1, 1), 'WEEKLY', 1, count=100), date(9999, 12, 31))
+
+
+class FailingNotifier:
+    def send_many(self, reminders):
+        return [ConnectionRefusedError('SMTP is down') for _ in reminders]
+
+
+class EventReminderTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+        self.pet = Pet.objects.create(user=self.user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01')
+        self.start = timezone.localdate() + timedelta(days=3)
+
+    def _create(self, **recurrence):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('calendar-list'), {
+                'pet': self.pet.id, 'event_type': 'VACCINATION', 'event_title': 'Щеплення',
+                'start_date': self.start.isoformat(), 'start_time': '10:00', 'recurrence': recurrence or None,
+            }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return EventReminder.objects.get(event_id=response.json()['payload']['id'])
+
+    @override_settings(CALENDAR_REMINDER_LEAD_MINUTES=60)
+    def test_series_reminder_is_sent_once_and_moves_to_next_occurrence(self):
+        reminder = self._create(freq='WEEKLY', count=3)
+        due_at = timezone.make_aware(datetime.combine(self.start, datetime.min.time().replace(hour=9)))
+        self.assertEqual((reminder.occurrence_date, reminder.due_at), (self.start, due_at))
+
+        notifier = get_notifier()
+        self.assertEqual(dispatch_due_reminders(notifier, now=due_at - timedelta(minutes=1)), 0)
+        # оренда (savepoint, SELECT, UPDATE, release) + overrides + фіксація (savepoint, SELECT, UPDATE, release)
+        with self.assertNumQueries(9):
+            self.assertEqual(dispatch_due_reminders(notifier, now=due_at), 1)
+        self.assertEqual(dispatch_due_reminders(notifier, now=due_at), 0)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual((mail.outbox[0].to, mail.outbox[0].subject), (['owner@example.com'], 'Нагадування: Щеплення'))
+
+        reminder.refresh_from_db()
+        self.assertEqual((reminder.sent_for, reminder.occurrence_date), (self.start, self.start + timedelta(days=7)))
+        # редагування події не повертає вже надіслане повторення
+        with self.captureOnCommitCallbacks(execute=True):
+            reminder.event.save()
+        reminder.refresh_from_db()
+        self.assertEqual(reminder.occurrence_date, self.start + timedelta(days=7))
+
+    @override_settings(CALENDAR_REMINDER_LEAD_MINUTES=10 * 24 * 60)
+    def test_failures_are_retried_and_completed_occurrences_skipped(self):
+        reminder = self._create()
+        now = timezone.now()
+        dispatch_due_reminders(FailingNotifier(), now=now)
+        reminder.refresh_from_db()
+        self.assertEqual((reminder.attempts, reminder.due_at), (1, now + timedelta(minutes=2)))
+        self.assertIn('SMTP is down', reminder.last_error)
+
+        call_command('send_reminders', '--once', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+        reminder.refresh_from_db()
+        self.assertEqual((reminder.attempts, reminder.due_at), (1, now + timedelta(minutes=2)))
+
+        series = self._create(freq='DAILY', count=2)
+        EventOccurrenceOverride.objects.create(event=series.event, occurrence_date=self.start, completed=True)
+        call_command('send_reminders', '--once', stdout=StringIO())
+        # перше повторення виконане - лист лише про друге, після нього серія закінчилась
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn((self.start + timedelta(days=1)).strftime('%d.%m.%Y'), mail.outbox[0].body)
+        series.refresh_from_db()
+        self.assertEqual((series.sent_for, series.occurrence_date, series.due_at),
+                         (self.start + timedelta(days=1), None, None))
+
+    @override_settings(CALENDAR_REMINDER_LEAD_MINUTES=10 * 24 * 60)
+    def test_batch_is_leased_and_rows_are_finished_independently(self):
+        moved, broken, plain = self._create(), self._create(freq='DAILY'), self._create()
+        now = timezone.now()
+
+        class ReschedulingNotifier:
+            def send_many(self, reminders):
+                # рядки взяті в оренду: другий воркер їх не бачить
+                assert dispatch_due_reminders(get_notifier(), now=now) == 0
+                # користувач переносить подію, поки листи ще йдуть
+                CalendarEvent.objects.filter(pk=moved.event_id).update(start_date=F('start_date') + timedelta(days=1))
+                schedule_reminders([moved.event_id])
+                return [None] * len(reminders)
+
+        with mock.patch('pet_care_app.reminders.next_date', side_effect=ValueError('bad rule')), \
+                self.assertLogs('pet_care_app.reminders', 'ERROR'):
+            self.assertEqual(dispatch_due_reminders(ReschedulingNotifier(), now=now), 3)
+        moved.refresh_from_db()
+        self.assertEqual((moved.sent_for, moved.occurrence_date), (None, self.start + timedelta(days=1)))
+        broken.refresh_from_db()
+        self.assertEqual((broken.sent_for, broken.due_at, broken.last_error), (self.start, None, 'bad rule'))
+        plain.refresh_from_db()
+        self.assertEqual((plain.sent_for, plain.due_at), (self.start, None))
+
+    def test_scheduling_failure_after_commit_does_not_fail_the_request(self):
+        with mock.patch('pet_care_app.signals.schedule_reminders', side_effect=RuntimeError('boom')), \
+                self.assertLogs('django', 'ERROR'):
+            reminder_count = EventReminder.objects.count()
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('calendar-list'), {
+                    'pet': self.pet.id, 'event_title': 'Vet', 'start_date': self.start.isoformat(),
+                }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(EventReminder.objects.count(), reminder_count)
+
+
+class CalendarBulkTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+        self.pet = Pet.objects.create(user=self.user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01')
+        stranger = User.objects.create_user(email='stranger@example.com', password='pass', full_name='Stranger')
+        self.foreign_pet = Pet.objects.create(user=stranger, pet_name='Tom', breed='Cat', sex='MALE',
+                                              birthday='2020-01-01')
+        self.events = CalendarEvent.objects.bulk_create([
+            CalendarEvent(pet=self.pet, event_title=f'Pill {i}', start_date='2025-03-01') for i in range(50)
+        ])
+
+    def _bulk(self, operations):
+        response = self.client.post(reverse('calendar-bulk'), operations, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['payload']
+
+    def test_fifty_updates_in_one_request(self):
+        operations = [{'op': 'update', 'id': event.id, 'data': {'completed': True}} for event in self.events]
+        # події + тварини + savepoint/UPDATE/release + версія колекції
+        with self.assertNumQueries(6):
+            results = self._bulk(operations)
+        self.assertEqual({result['status'] for result in results}, {200})
+        self.assertEqual(CalendarEvent.objects.filter(completed=True).count(), 50)
+
+    def test_mixed_batch_reports_per_item_results(self):
+        foreign = CalendarEvent.objects.create(pet=self.foreign_pet, event_title='Not mine', start_date='2025-03-01')
+        results = self._bulk([
+            {'op': 'create', 'data': {'pet': self.pet.id, 'event_title': 'Vaccine', 'start_date': '2025-04-01'}},
+            {'op': 'create', 'data': {'pet': self.foreign_pet.id, 'event_title': 'Sneaky'}},
+            {'op': 'update', 'id': self.events[0].id, 'data': {'start_date': '2025-05-01'}},
+            {'op': 'update', 'id': self.events[1].id, 'data': {'start_date': 'soon'}},
+            {'op': 'delete', 'id': self.events[0].id},
+            {'op': 'delete', 'id': foreign.id},
+            {'op': 'delete', 'id': self.events[2].id},
+        ])
+        self.assertEqual([result['status'] for result in results], [201, 404, 200, 400, 400, 404, 204])
+        self.assertEqual(results[0]['payload']['event_title'], 'Vaccine')
+        self.assertTrue(CalendarEvent.objects.filter(pk=results[0]['payload']['id']).exists())
+        self.assertEqual(str(CalendarEvent.objects.get(pk=self.events[0].id).start_date), '2025-05-01')
+        self.assertFalse(CalendarEvent.objects.filter(pk=self.events[2].id).exists())
+        self.assertTrue(CalendarEvent.objects.filter(pk=foreign.id).exists())
+
+    def test_updates_keep_recurrence_invariants(self):
+        series = self.events[3]
+        EventRecurrence.objects.create(event=series, freq='WEEKLY', until='2025-06-30')
+        results = self._bulk([
+            {'op': 'update', 'id': series.id, 'data': {'start_date': None}},
+            {'op': 'update', 'id': self.events[4].id, 'data': {'start_date': None}},
+        ])
+        self.assertEqual([result['status'] for result in results], [400, 200])
+        self.assertIn('start_date', results[0]['errors'])
+        self.assertIsNone(results[1]['payload']['recurrence'])
+
+        results = self._bulk([{'op': 'update', 'id': series.id, 'data': {'start_date': '2025-07-01'}}])
+        self.assertEqual((results[0]['status'], list(results[0]['errors'])), (400, ['recurrence']))
+        results = self._bulk([{'op': 'update', 'id': series.id, 'data': {'completed': True}}])
+        self.assertEqual(results[0]['payload']['recurrence']['ends_on'], '2025-06-30')
+        self.assertEqual(str(CalendarEvent.objects.get(pk=series.id).start_date), '2025-03-01')
+
+
+class JournalSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+        self.rex = Pet.objects.create(user=self.user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01')
+        self.tom = Pet.objects.create(user=self.user, pet_name='Tom', breed='Cat', sex='MALE', birthday='2021-01-01')
+        for i in range(5):
+            JournalEntry.objects.create(pet=self.rex, entry_type='TRAINING', entry_title=f'Walk {i}',
+                                        description='Прогулянка в парку')
+        JournalEntry.objects.create(pet=self.tom, entry_type='BATH', entry_title='Купання', description='Shampoo')
+
+    def _get(self, **params):
+        response = self.client.get(reverse('journal-list'), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_keyset_pages_cover_all_entries(self):
+        titles, cursor = [], None
+        while True:
+            page = self._get(page_size=4, **({'cursor': cursor} if cursor else {}))
+            titles += [entry['entry_title'] for entry in page['payload']]
+            cursor = page['next']
+            if not cursor:
+                break
+        self.assertEqual(titles, ['Купання'] + [f'Walk {i}' for i in reversed(range(5))])
+
+    def test_search_and_filters(self):
+        self.assertEqual(len(self._get(q='парку')['payload']), 5)
+        self.assertEqual([e['entry_title'] for e in self._get(q='shampoo')['payload']], ['Купання'])
+        self.assertEqual(self._get(q='walk "3"')['payload'][0]['entry_title'], 'Walk 3')
+        self.assertEqual(len(self._get(q='парку', pet=self.tom.id)['payload']), 0)
+        self.assertEqual(len(self._get(entry_type='BATH')['payload']), 1)
+        today = timezone.localdate().isoformat()
+        self.assertEqual(len(self._get(**{'from': today, 'to': today})['payload']), 6)
+        self.assertEqual(len(self._get(to='2000-01-01')['payload']), 0)
+
+        entry = JournalEntry.objects.get(entry_title='Купання')
+        entry.description = 'Нові кігті'
+        entry.save()
+        self.assertEqual(self._get(q='shampoo')['payload'], [])
+        self.assertEqual(self.client.get(reverse('journal-list'), {'from': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('journal-list'), {'to': '9999-12-31'}).status_code, 400)
+
+
+class PetTimelineTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+        self.rex = Pet.objects.create(user=self.user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01')
+        for day in (3, 1, 5):
+            entry = JournalEntry.objects.create(pet=self.rex, entry_type='TRAINING', entry_title=f'Walk {day}')
+            created_at = datetime(2025, 1, day, 12, tzinfo=dt_timezone.utc)
+            JournalEntry.objects.filter(pk=entry.pk).update(created_at=created_at)
+        for day in (2, 4, 4):
+            CalendarEvent.objects.create(pet=self.rex, event_type='VACCINATION', event_title=f'Vet {day}',
+                                         start_date=date(2025, 1, day))
+        CalendarEvent.objects.create(pet=self.rex, event_title='Someday', start_date=None)
+
+    def _get(self, **params):
+        response = self.client.get(reverse('pets-timeline', args=[self.rex.id]), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_journal_and_calendar_are_interleaved_across_pages(self):
+        titles, cursor = [], None
+        while True:
+            with self.assertNumQueries(2):
+                page = self._get(page_size=2, **({'cursor': cursor} if cursor else {}))
+            titles += [item['title'] for item in page['payload']]
+            cursor = page['next']
+            if not cursor:
+                break
+        self.assertEqual(titles, ['Walk 5', 'Vet 4', 'Vet 4', 'Walk 3', 'Vet 2', 'Walk 1'])
+        self.assertEqual(self._get(page_size=1)['payload'][0]['date'], '2025-01-05')
+
+    def test_kind_and_type_filters(self):
+        self.assertEqual([item['kind'] for item in self._get(kind='calendar')['payload']], ['calendar'] * 3)
+        self.assertEqual(len(self._get(type='TRAINING')['payload']), 3)
+        url = reverse('pets-timeline', args=[self.rex.id])
+        self.assertEqual(self.client.get(url, {'kind': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'cursor': 'WyJ4Iiwiam91cm5hbCIsMV0'}).status_code, 400)
+        other = User.objects.create_user(email='other@example.com', password='pass', full_name='Other')
+        self.assertEqual(api_client(other).get(url).status_code, 404)
+
+
+class HistoryExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+        self.rex = Pet.objects.create(user=self.user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01')
+        tom = Pet.objects.create(user=self.user, pet_name='Tom', breed='Cat', sex='MALE', birthday='2021-01-01')
+        for i in range(3):
+            JournalEntry.objects.create(pet=self.rex, entry_type='TRAINING', entry_title=f'Walk {i}',
+                                        description='Прогулянка, "парк"')
+        JournalEntry.objects.create(pet=tom, entry_type='BATH', entry_title='Купання')
+        event = CalendarEvent.objects.create(pet=self.rex, event_title='Pills', start_date=date(2025, 1, 2))
+        EventRecurrence.objects.create(event=event, freq='WEEKLY', interval=1, count=4)
+
+    def _lines(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_pet_history_streams_as_ndjson(self):
+        lines = self._lines(self.client.get(reverse('pets-export', args=[self.rex.id])))
+        self.assertEqual([(line['kind'], line.get('entry_title') or line['event_title']) for line in lines],
+                         [('journal', 'Walk 0'), ('journal', 'Walk 1'), ('journal', 'Walk 2'), ('calendar', 'Pills')])
+        self.assertEqual(lines[-1]['recurrence']['count'], 4)
+        self.assertEqual(len(self._lines(self.client.get(reverse('profile-export'), {'kind': 'journal'}))), 4)
+
+    def test_csv_export_and_validation(self):
+        response = self.client.get(reverse('pets-export', args=[self.rex.id]), {'format': 'csv'})
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="pet-{self.rex.id}-history.csv"')
+        rows = list(csv.reader(b''.join(response.streaming_content).decode('utf-8-sig').splitlines()))
+        self.assertEqual(rows[0][:5], ['kind', 'id', 'pet', 'type', 'title'])
+        self.assertEqual(rows[1][7], 'Прогулянка, "парк"')
+        self.assertEqual(rows[-1][0], 'calendar')
+
+        JournalEntry.objects.create(pet=self.rex, entry_title='=HYPERLINK("http://evil")', description='@SUM(A1)')
+        response = self.client.get(reverse('pets-export', args=[self.rex.id]), {'format': 'csv', 'kind': 'journal'})
+        rows = list(csv.reader(b''.join(response.streaming_content).decode('utf-8-sig').splitlines()))
+        self.assertEqual((rows[-1][4], rows[-1][7]), ('\'=HYPERLINK("http://evil")', "'@SUM(A1)"))
+        ndjson = self._lines(self.client.get(reverse('pets-export', args=[self.rex.id]), {'kind': 'journal'}))
+        self.assertEqual(ndjson[-1]['entry_title'], '=HYPERLINK("http://evil")')
+
+        self.assertEqual(self.client.get(reverse('profile-export'), {'format': 'xml'}).status_code, 400)
+        other = User.objects.create_user(email='other@example.com', password='pass', full_name='Other')
+        self.assertEqual(api_client(other).get(reverse('pets-export', args=[self.rex.id])).status_code, 404)
+
+    async def test_asgi_export_uses_async_iterator(self):
+        token = await sync_to_async(lambda: str(MyRefreshToken.for_user(self.user).access_token))()
+        response = await AsyncClient().get(reverse('profile-export'), headers={'Authorization': f'Bearer {token}'})
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.splitlines()), 5)
+
+
+class PhotoUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.media_root = Path(media_root.name)
+        settings_override = override_settings(
+            MEDIA_STORAGE_BACKEND='pet_care_app.media_storage.LocalMediaStorage',
+            MEDIA_ROOT=self.media_root,
+            MEDIA_URL='/media/',
+            MEDIA_UPLOAD_WORKERS=0,
+            MEDIA_UPLOAD_RETRY_BACKOFF=0,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+
+    def _create_pet(self, photo=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('pets-list'), {
+                'pet_name': 'Rex', 'breed': 'Beagle', 'sex': 'MALE', 'birthday': '2020-01-01',
+                'photo': photo or make_photo(),
+            }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        payload = response.json()['payload']
+        self.assertEqual(payload['photo_status'], 'PENDING')
+        self.assertIsNone(payload['photo_url'])
+        return Pet.objects.get(pk=payload['id'])
+
+    def test_pet_photo_is_uploaded_after_commit(self):
+        pet = self._create_pet()
+        self.assertEqual(pet.photo_status, 'READY')
+        self.assertEqual(set(pet.photo_variants), {'full', 'medium', 'thumbnail'})
+        self.assertEqual(pet.photo_url, pet.photo_variants['full'])
+        self.assertTrue(pet.photo_url.startswith('/media/pet_photos/pet_'))
+        self.assertTrue((self.media_root / pet.photo_url.removeprefix('/media/')).is_file())
+
+    @override_settings(MEDIA_PHOTO_VARIANTS={'full': 400, 'thumbnail': 100})
+    def test_variants_are_resized_oriented_and_stripped(self):
+        # orientation 6 = повернути на 90°, тож 800x600 стає 600x800
+        pet = self._create_pet(make_photo(size=(800, 600), orientation=6))
+        sizes = {}
+        for name, url in pet.photo_variants.items():
+            with Image.open(self.media_root / url.removeprefix('/media/')) as image:
+                self.assertEqual(image.format, 'WEBP')
+                self.assertNotIn(0x0112, image.getexif())
+                sizes[name] = image.size
+        self.assertEqual(sizes, {'full': (300, 400), 'thumbnail': (75, 100)})
+
+    def test_failed_upload_is_retried_then_marked_failed(self):
+        with self.assertLogs('pet_care_app.uploads', 'WARNING'), \
+                mock.patch('pet_care_app.media_storage.LocalMediaStorage.save', side_effect=OSError) as save:
+            pet = self._create_pet()
+        self.assertEqual(save.call_count, 3)
+        self.assertEqual(pet.photo_status, 'FAILED')
+        self.assertIsNone(pet.photo_url)
+
+    @override_settings(MEDIA_UPLOAD_WORKERS=1, MEDIA_UPLOAD_QUEUE_SIZE=0)
+    def test_full_queue_fails_the_photo_instead_of_uploading_inline(self):
+        with mock.patch('pet_care_app.uploads._slots') as slots, mock.patch('pet_care_app.uploads._executor'), \
+                mock.patch('pet_care_app.uploads._process') as process, self.assertLogs('pet_care_app.uploads'):
+            slots.acquire.return_value = False
+            pet = self._create_pet()
+        process.assert_not_called()
+        self.assertEqual(pet.photo_status, 'FAILED')
+
+    def test_worker_crash_is_logged_and_stale_pending_photos_expire(self):
+        with mock.patch('pet_care_app.uploads._slots'), mock.patch('pet_care_app.uploads.connections'), \
+                mock.patch('pet_care_app.uploads._process', side_effect=RuntimeError('boom')), \
+                self.assertLogs('pet_care_app.uploads', 'ERROR') as logs:
+            uploads._run_in_worker(mock.Mock(key='pets/image_1'))
+        self.assertIn('Photo upload pets/image_1 crashed', logs.output[0])
+
+        with mock.patch('pet_care_app.uploads._submit'):
+            stale, fresh = self._create_pet(), self._create_pet()
+        Pet.objects.filter(pk=stale.pk).update(photo_pending_since=timezone.now() - timedelta(hours=1))
+        etag = self.client.get(reverse('pets-list'))['ETag']
+        call_command('expire_photo_uploads', stdout=StringIO())
+        statuses = dict(Pet.objects.values_list('pk', 'photo_status'))
+        self.assertEqual((statuses[stale.pk], statuses[fresh.pk]), ('FAILED', 'PENDING'))
+        self.assertEqual(self.client.get(reverse('pets-list'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class EnvelopeResponseTests(TestCase):
+    def test_fast_encoder_matches_stdlib_output(self):
+        data = {
+            'payloadType': 'Dto', 'payload': [{'rating': Decimal('4.5'), 'name': 'Кіт', 'id': 1}],
+            'at': datetime(2025, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc), 'day': date(2025, 1, 2), 7: 'key',
+        }
+        expected = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+        expected['at'] = '2025-01-02T03:04:05Z'
+        self.assertEqual(json.loads(dumps(data)), expected)
+        response = EnvelopeResponse('PetListDto', [], status=201, next=None)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), {'payloadType': 'PetListDto', 'payload': [], 'next': None})
+
+
+class ValuesSerializerTests(TestCase):
+    def test_output_is_byte_identical_to_drf_serializers(self):
+        user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        pet = Pet.objects.create(user=user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01',
+                                 photo_url='https://cdn.example/rex.webp', photo_status='READY',
+                                 photo_variants={'thumbnail': 'https://cdn.example/rex_t.webp'})
+        Pet.objects.create(user=user, pet_name='Tom', breed='Cat', birthday='2021-05-05')
+        CalendarEvent.objects.create(pet=pet, event_title='Checkup', start_date='2025-01-01', start_time='09:30')
+        series = CalendarEvent.objects.create(pet=pet, event_title='Pills', start_date=date(2025, 1, 2))
+        EventRecurrence.objects.create(event=series, freq='WEEKLY', count=3, exdates=['2025-01-09'])
+        JournalEntry.objects.create(pet=pet, entry_title='Walk', description=None)
+        SitePartner.objects.create(site_name='Vet', site_url='https://vet.example', rating=Decimal('4.5'))
+
+        cases = [
+            (pet_values, PetSerializer, Pet.objects.order_by('id')),
+            (calendar_event_values, CalendarEventSerializer,
+             CalendarEvent.objects.select_related('recurrence').order_by('id')),
+            (journal_entry_values, JournalEntrySerializer, JournalEntry.objects.order_by('id')),
+            (site_partner_values, SitePartnerSerializer, SitePartner.objects.order_by('id')),
+        ]
+        for fast, serializer_class, queryset in cases:
+            with self.subTest(serializer_class.__name__):
+                expected = dumps(serializer_class(queryset, many=True).data)
+                self.assertEqual(dumps(fast.many(queryset.values(*fast.columns))), expected)
+
+
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        self.client = api_client(self.user)
+        Pet.objects.create(user=self.user, pet_name='Rex', breed='Mixed', sex='MALE', birthday='2020-01-01')
+
+    def test_server_timing_header_is_opt_in(self):
+        with self.assertLogs('pet_care_app.perf', 'INFO'):
+            self.assertNotIn('Server-Timing', self.client.get(reverse('pets-list')))
+
+    @override_settings(PERF_SERVER_TIMING=True)
+    def test_server_timing_header_and_log_line(self):
+        with self.assertLogs('pet_care_app.perf', 'INFO') as logs:
+            response = self.client.get(reverse('pets-list'))
+        self.assertRegex(response['Server-Timing'],
+                         r'^db;dur=[\d.]+;desc="2 queries", serialize;dur=[\d.]+, total;dur=')
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((record['view'], record['status'], record['queries'], record['query_budget']),
+                         ('pets-list', 200, 2, 2))
+        self.assertNotIn('n_plus_one', record)
+
+    def test_repeated_query_shapes_are_flagged(self):
+        profile = RequestProfile()
+        for ids in range(1, 6):
+            profile.add_query(f'SELECT * FROM "Pets" WHERE id IN ({", ".join(["%s"] * ids)})', 0.001)
+        profile.add_query('SELECT 1', 0.001)
+        self.assertEqual(profile.repeated_queries(), [('SELECT * FROM "Pets" WHERE id IN (...)', 5)])
+
+    @override_settings(PERF_STRICT_QUERY_BUDGET=True)
+    def test_strict_mode_fails_views_over_budget(self):
+        with mock.patch.object(PetListView, 'query_budget', {'GET': 1}), self.assertLogs('pet_care_app.perf'):
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'pets-list made 2 queries, budget is 1'):
+                self.client.get(reverse('pets-list'))
+
+
+class PerfSuiteTests(TestCase):
+    def test_seed_perf_data_creates_consistent_rows(self):
+        out = StringIO()
+        call_command('seed_perf_data', users=4, pets_per_user=2, events_per_pet=5, journal_per_pet=3, posts=6,
+                     comments_per_post=2, likes_per_post=3, partners=5, watchlist_per_user=2, stdout=out)
+        created = json.loads(out.getvalue())['created']
+        self.assertEqual((created['pets'], created['calendar_events'], created['forum_likes']), (8, 40, 18))
+        self.assertEqual(JournalEntry.objects.count(), 24)
+        self.assertFalse(ForumPost.objects.exclude(likes_count=3, comments_count=2).exists())
+        self.assertEqual(ForumLike.objects.values('forum_post').distinct().count(), 6)
+        self.assertGreater(JournalEntry.objects.values('created_at').distinct().count(), 1)
+        for recurrence in EventRecurrence.objects.select_related('event'):
+            self.assertEqual(recurrence.ends_on, last_occurrence(
+                recurrence.event.start_date, recurrence.freq, recurrence.interval, recurrence.count, None))
+
+    def test_every_route_is_benchmarked_or_explicitly_skipped(self):
+        call_command('seed_perf_data', users=2, posts=1, partners=1, stdout=StringIO())
+        user = User.objects.get(email='perf0@example.com')
+        command = RunBenchmarksCommand()
+        reads, skipped = command.targets(user, {'include_writes': False, 'password': 'x'})
+        writes, _ = command.targets(user, {'include_writes': True, 'password': 'x'})
+        names = {pattern.name for pattern in get_resolver().url_patterns if getattr(pattern, 'name', None)}
+        covered = {resolve(path.split('?')[0]).url_name for _, path, *_ in writes}
+        self.assertEqual(covered | set(skipped), names)
+        self.assertIn('signin', skipped)
+        self.assertTrue(all(len(target) == 2 for target in reads))
+
+    def test_explain_list_queries_uses_the_views_first_page(self):
+        call_command('seed_perf_data', users=2, posts=1, partners=1, stdout=StringIO())
+        out = StringIO()
+        call_command('explain_list_queries', user='perf0@example.com', stdout=out)
+        sections = dict(
+            section.split(' ==\n', 1) for section in out.getvalue().split('== ')[1:]
+        )
+        self.assertIn('forum search (posts, first page)', sections)
+        self.assertIn('forum search (comments, first page)', sections)
+        self.assertIn('pet timeline (busiest pet, first page)', sections)
+        self.assertIn('ORDER BY', sections['journal (first page)'])
+        self.assertIn(f'LIMIT {settings.JOURNAL_PAGE_SIZE + 1}', sections['journal (first page)'])
+
+
+class JWTAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+        token = MyRefreshToken.for_user(self.user).access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_read_endpoints_do_not_load_the_user(self):
+        # версія колекції + сам список
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('pets-list'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_full_user_is_cached_and_invalidated_on_profile_update(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(reverse('profile')).json()['full_name'], 'Owner')
+        with self.assertNumQueries(0):
+            self.client.get(reverse('profile'))
+        self.client.patch(reverse('profile'), {'full_name': 'Renamed'}, format='json')
+        self.assertEqual(self.client.get(reverse('profile')).json()['full_name'], 'Renamed')
+
+    def test_profile_update_does_not_write_back_cached_columns(self):
+        self.client.get(reverse('profile'))
+        # інший воркер змінив пароль і деактивував акаунт; кеш цього процесу про це не знає
+        User.objects.filter(pk=self.user.pk).update(password=make_password('changed'))
+        self.client.patch(reverse('profile'), {'full_name': 'Renamed'}, format='json')
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.full_name, self.user.check_password('changed')), ('Renamed', True))
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.patch(reverse('profile'), {'full_name': 'Again'}, format='json')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(User.objects.get(pk=self.user.pk).full_name, 'Renamed')
+
+
+class SignInTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='owner@example.com', password='secret-pass', full_name='Owner')
+
+    def _sign_in(self, password):
+        return self.client.post(
+            reverse('signin'), {'email': 'owner@example.com', 'password': password}, content_type='application/json'
+        )
+
+    def test_sign_in_returns_token_and_refresh_cookie(self):
+        response = self._sign_in('secret-pass')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('accessToken', response.json()['payload'])
+        self.assertIn('refresh_token', response.cookies)
+        self.assertEqual(self._sign_in('wrong').status_code, 401)
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        self.user.password = make_password('secret-pass', hasher='pbkdf2_sha256')
+        self.user.save()
+        self.assertEqual(self._sign_in('secret-pass').status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('bcrypt_sha256$'))
+
+    def test_sign_up_stores_prehashed_password(self):
+        response = self.client.post(reverse('signup'), {
+            'full_name': 'New', 'email': 'new@example.com', 'password': 'another-pass',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(email='new@example.com').check_password('another-pass'))
+        duplicate = self.client.post(reverse('signup'), {
+            'full_name': 'New', 'email': 'new@example.com', 'password': 'another-pass',
+        })
+        self.assertEqual(duplicate.status_code, 400)
+        self.assertIn('email', duplicate.json())
+
+    def test_full_hashing_queue_returns_503(self):
+        with mock.patch('pet_care_app.hashing.PasswordHashingExecutor.run', side_effect=HashingBusy):
+            response = self._sign_in('secret-pass')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    async def test_cancelled_queued_jobs_free_their_slots(self):
+        hashing = PasswordHashingExecutor(workers=1, queue_limit=2)
+        self.addCleanup(hashing._executor.shutdown)
+        started, release = threading.Event(), threading.Event()
+
+        def busy():
+            started.set()
+            release.wait(5)
+
+        running = asyncio.ensure_future(hashing.run(busy))
+        await asyncio.to_thread(started.wait, 5)
+        queued = [asyncio.ensure_future(hashing.run(make_password, 'x')) for _ in range(2)]
+        await asyncio.sleep(0)
+        with self.assertRaises(HashingBusy):
+            await hashing.run(make_password, 'x')
+        # клієнти відключились, поки їхні задачі стояли в черзі
+        for task in queued:
+            task.cancel()
+        await asyncio.gather(*queued, return_exceptions=True)
+        release.set()
+        await running
+        self.assertEqual([hashing._slots.acquire(blocking=False) for _ in range(4)], [True, True, True, False])
+
+
+class DatabasePoolTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.user = User.objects.create_user(email='owner@example.com', password='pass', full_name='Owner')
+
+    @skipUnless(PoolTimeout, 'psycopg_pool is not installed')
+    def test_exhausted_pool_returns_503(self):
+        def get_object():
+            try:
+                raise PoolTimeout("couldn't get a connection after 5.00 sec")
+            except PoolTimeout as exc:
+                raise OperationalError(str(exc)) from exc
+
+        with mock.patch('pet_care_app.views.UserProfileView.get_object', side_effect=get_object), \
+                self.assertLogs('pet_care_app.db_pool', 'WARNING'):
+            response = api_client(self.user).get(reverse('profile'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_pool_stats_are_staff_only(self):
+        self.assertEqual(api_client(self.user).get(reverse('db-pool-stats')).status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        response = api_client(self.user).get(reverse('db-pool-stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['payload'], {'alias': 'default', 'pooled': False})
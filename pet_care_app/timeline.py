@@ -0,0 +1,91 @@
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.db.models import BooleanField, DateTimeField, F, Q, TimeField, Value
+from django.db.models.functions import Cast
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import CalendarEvent, JournalEntry
+
+TIMELINE_KINDS = ('journal', 'calendar')
+TIMELINE_ORDERING = ('-ts', '-kind', '-id')
+TIMELINE_COLUMNS = ('ts', 'kind', 'id', 'pet_id', 'type', 'title', 'description', 'start_time', 'completed')
+
+
+def _after(kind, column, value, exact, cursor):
+    # Рядки гілки, що йдуть після курсора (ts, kind, id) у порядку спадання, як умова
+    # по індексованій колонці гілки. exact=False - ts курсора не дорівнює жодному ts гілки
+    _, cursor_kind, cursor_id = cursor
+    if not exact:
+        return Q(**{f'{column}__lte': value})
+    tie = Q(**{column: value})
+    if kind == cursor_kind:
+        tie &= Q(id__lt=cursor_id)
+    elif kind > cursor_kind:
+        tie = Q(pk__in=[])
+    return Q(**{f'{column}__lt': value}) | tie
+
+
+def timeline_querysets(pet_id, kinds=TIMELINE_KINDS, item_type=None, cursor=None):
+    # Гілки UNION ALL зі спільним набором колонок; cursor - розібраний (ts: datetime, kind, id).
+    # Кожна гілка сортується і фільтрується так, як її індекс: (pet, -created_at) / (pet, start_date, ...)
+    branches = []
+    if 'journal' in kinds:
+        entries = JournalEntry.objects.filter(pet_id=pet_id)
+        if item_type:
+            entries = entries.filter(entry_type=item_type)
+        if cursor is not None:
+            entries = entries.filter(_after('journal', 'created_at', cursor[0], True, cursor))
+        branches.append(entries.annotate(
+            ts=F('created_at'), kind=Value('journal'), type=F('entry_type'), title=F('entry_title'),
+            start_time=Value(None, output_field=TimeField()),
+            completed=Value(None, output_field=BooleanField()),
+        ).order_by('-created_at', '-id').values(*TIMELINE_COLUMNS))
+    if 'calendar' in kinds:
+        # подія без дати не має місця на стрічці; повторювані - одним рядком на дату початку серії.
+        # ts події - північ start_date у часовому поясі з'єднання (Django тримає його в UTC)
+        events = CalendarEvent.objects.filter(pet_id=pet_id, start_date__isnull=False)
+        if item_type:
+            events = events.filter(event_type=item_type)
+        if cursor is not None:
+            ts = cursor[0].astimezone(dt_timezone.utc)
+            exact = ts.timetz() == time(tzinfo=dt_timezone.utc)
+            events = events.filter(_after('calendar', 'start_date', ts.date(), exact, cursor))
+        branches.append(events.annotate(
+            ts=Cast('start_date', DateTimeField()), kind=Value('calendar'), type=F('event_type'),
+            title=F('event_title'),
+        ).order_by('-start_date', '-id').values(*TIMELINE_COLUMNS))
+    return branches
+
+
+def parse_timeline_cursor(values):
+    # -> (ts, kind, id) або None, якщо курсор підроблений
+    ts, kind, item_id = values
+    if not isinstance(ts, str) or kind not in TIMELINE_KINDS or not isinstance(item_id, int):
+        return None
+    try:
+        ts = datetime.fromisoformat(ts)
+    except ValueError:
+        return None
+    if timezone.is_naive(ts):
+        return None
+    return ts, kind, item_id
+
+
+_timestamp = serializers.DateTimeField().to_representation
+
+
+def timeline_item(row):
+    return {
+        'kind': row['kind'],
+        'id': row['id'],
+        'pet': row['pet_id'],
+        'type': row['type'],
+        'title': row['title'],
+        'description': row['description'],
+        'timestamp': _timestamp(row['ts']),
+        'date': (timezone.localdate(row['ts']) if row['kind'] == 'journal'
+                 else row['ts'].astimezone(dt_timezone.utc).date()).isoformat(),
+        'start_time': row['start_time'].isoformat() if row['start_time'] else None,
+        'completed': row['completed'],
+    }
@@ -0,0 +1,146 @@
+import logging
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import IO, Callable, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .images import build_photo_variants, photo_format
+from .media_storage import get_media_storage
+from .profiling import span
+
+logger = logging.getLogger(__name__)
+
+PHOTO_PENDING = 'PENDING'
+PHOTO_READY = 'READY'
+PHOTO_FAILED = 'FAILED'
+
+
+@dataclass
+class PhotoUpload:
+    model: type
+    pk: int
+    key: str
+    file: IO[bytes]
+    on_done: Optional[Callable[[], None]] = None
+
+
+def pending_photo():
+    # Поля рядка, чиє фото чекає на завантаження; за photo_pending_since expire_photo_uploads
+    # знаходить рядки, завантаження яких загубилось (наприклад, з перезапуском воркера)
+    return {'photo_status': PHOTO_PENDING, 'photo_pending_since': timezone.now()}
+
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _slots = threading.BoundedSemaphore(
+                    settings.MEDIA_UPLOAD_WORKERS + settings.MEDIA_UPLOAD_QUEUE_SIZE
+                )
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.MEDIA_UPLOAD_WORKERS, thread_name_prefix='photo-upload'
+                )
+    return _executor
+
+
+def schedule_photo_upload(instance, photo, prefix: str, on_done=None):
+    # Рядок вже збережено з photo_status=PENDING; файл копіюємо, бо після відповіді
+    # Django закриває/видаляє тимчасові файли запиту
+    spooled = tempfile.SpooledTemporaryFile(max_size=settings.MEDIA_UPLOAD_SPOOL_MAX_MEMORY)
+    for chunk in photo.chunks():
+        spooled.write(chunk)
+    job = PhotoUpload(
+        model=type(instance),
+        pk=instance.pk,
+        key=f"{prefix}/image_{uuid.uuid4().hex}",
+        file=spooled,
+        on_done=on_done,
+    )
+    transaction.on_commit(lambda: _submit(job))
+
+
+def _submit(job):
+    if settings.MEDIA_UPLOAD_WORKERS <= 0:
+        _process(job)
+        return
+    executor = _get_executor()
+    if not _slots.acquire(blocking=False):
+        # Черга переповнена: обробка й S3 у потоці запиту знову зробили б відповідь залежною від
+        # розміру фото, тож завантаження відхиляється - клієнт бачить FAILED і може повторити
+        logger.warning('Photo upload queue is full, dropping %s', job.key)
+        try:
+            job.model.objects.filter(pk=job.pk).update(photo_status=PHOTO_FAILED)
+        finally:
+            _release(job)
+        return
+    executor.submit(_run_in_worker, job)
+
+
+def _run_in_worker(job):
+    # Виняток з пулу нікуди не дійшов би; рядок лишається PENDING до expire_photo_uploads
+    try:
+        _process(job)
+    except Exception:
+        logger.exception('Photo upload %s crashed', job.key)
+    finally:
+        _slots.release()
+        connections.close_all()
+
+
+def _release(job):
+    job.file.close()
+    if job.on_done is not None:
+        job.on_done()
+
+
+def _process(job):
+    try:
+        try:
+            job.file.seek(0)
+            variants = build_photo_variants(job.file)
+        except Exception:
+            logger.exception('Photo %s could not be processed', job.key)
+            job.model.objects.filter(pk=job.pk).update(photo_status=PHOTO_FAILED)
+            return
+
+        _, extension, content_type = photo_format()
+        urls = {}
+        for name, content in variants:
+            try:
+                urls[name] = _save_with_retry(content, f"{job.key}_{name}.{extension}", content_type)
+            except Exception:
+                job.model.objects.filter(pk=job.pk).update(photo_status=PHOTO_FAILED)
+                return
+        job.model.objects.filter(pk=job.pk).update(
+            photo_url=urls[variants[0][0]], photo_variants=urls, photo_status=PHOTO_READY
+        )
+    finally:
+        _release(job)
+
+
+def _save_with_retry(content, key, content_type):
+    storage = get_media_storage()
+    attempts = settings.MEDIA_UPLOAD_MAX_ATTEMPTS
+    for attempt in range(1, attempts + 1):
+        content.seek(0)
+        try:
+            with span('storage'):
+                return storage.save(content, key, content_type=content_type)
+        except Exception:
+            logger.warning('Photo upload %s failed (attempt %s/%s)', key, attempt, attempts, exc_info=True)
+            if attempt == attempts:
+                raise
+            time.sleep(settings.MEDIA_UPLOAD_RETRY_BACKOFF * 2 ** (attempt - 1))
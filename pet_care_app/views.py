@@ -1,10 +1,20 @@
-from django.http import JsonResponse
-from django.contrib.auth.hashers import check_password
+import json
+from datetime import date, timedelta
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from .serializers import *
-from rest_framework import status, permissions, generics
+from rest_framework import status, permissions
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from .hashing import HashingBusy, get_password_hashing
+from .authentication import CachedJWTAuthentication, ClaimsJWTAuthentication, user_cache
+from .db_pool import pool_stats
+from .reminders import schedule_reminders
+from .responses import EnvelopeResponse, FastJsonResponse
 from rest_framework.permissions import AllowAny
 from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
@@ -12,6 +22,9 @@ from rest_framework.generics import RetrieveUpdateAPIView
 from django.shortcuts import get_object_or_404
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_simplejwt.settings import api_settings
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
 
 
 class MyRefreshToken(RefreshToken):
@@ -48,123 +61,158 @@ class CookieTokenRefreshView(TokenRefreshView):
         return response
 
 
-class SignInView(APIView):
-    permission_classes = [AllowAny]
-
-    def post(self, request):
-        email = request.data.get("email")
-        password = request.data.get("password")
+def _set_refresh_cookie(response, refresh):
+    response.set_cookie(
+        key="refresh_token",
+        value=str(refresh),
+        httponly=True,
+        secure=False,
+        samesite="Strict",
+        max_age=24 * 3600
+    )
+
+
+def _hashing_busy_response():
+    response = FastJsonResponse(
+        {"error": "Server is busy, please try again later"},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+    response["Retry-After"] = "1"
+    return response
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class SignInView(View):
+    # Async: bcrypt виконується в окремому пулі (hashing.py), а не в потоці запиту
+
+    async def post(self, request):
+        if request.content_type == 'application/json':
+            try:
+                data = json.loads(request.body or b'{}')
+            except ValueError:
+                return FastJsonResponse({"error": "Malformed JSON"}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            data = request.POST
+        email = data.get("email")
+        password = data.get("password")
 
         try:
-            user = User.objects.get(email=email)
+            user = await User.objects.aget(email=email)
         except User.DoesNotExist:
-            return JsonResponse(
+            return FastJsonResponse(
                 {"error": "Invalid email or password"},
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        if not check_password(password, user.password):
-            return JsonResponse(
+        try:
+            is_correct, new_password = await get_password_hashing().verify_password(password, user.password)
+        except HashingBusy:
+            return _hashing_busy_response()
+        if not is_correct:
+            return FastJsonResponse(
                 {"error": "Invalid email or password"},
                 status=status.HTTP_401_UNAUTHORIZED
             )
+        if new_password:
+            user.password = new_password
+            await user.asave(update_fields=['password'])
 
-        refresh = MyRefreshToken.for_user(user)
+        refresh = await sync_to_async(MyRefreshToken.for_user)(user)
         access_token = str(refresh.access_token)
 
-        response = JsonResponse({
-            "payloadType": "LoginResponseDto",
-            "payload": {"accessToken": access_token}
-        }, status=status.HTTP_200_OK)
-
-        response.set_cookie(
-            key="refresh_token",
-            value=str(refresh),
-            httponly=True,
-            secure=False,
-            samesite="Strict",
-            max_age=24 * 3600
-        )
+        response = EnvelopeResponse("LoginResponseDto", {"accessToken": access_token}, status=status.HTTP_200_OK)
+        _set_refresh_cookie(response, refresh)
         return response
 
 
-class SignUpView(APIView):
-    permission_classes = [AllowAny]
-    parser_classes = [MultiPartParser, FormParser]
+@method_decorator(csrf_exempt, name='dispatch')
+class SignUpView(View):
 
-    def post(self, request):
-        serializer = SignUpSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+    async def post(self, request):
+        data = request.POST.dict()
+        data.update(request.FILES.dict())
+        serializer = SignUpSerializer(data=data)
+        if not await sync_to_async(serializer.is_valid)():
+            return FastJsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        refresh = MyRefreshToken.for_user(user)
+        try:
+            password = await get_password_hashing().make_password(serializer.validated_data["password"])
+        except HashingBusy:
+            return _hashing_busy_response()
+        user = await sync_to_async(serializer.save)(password_hash=password)
+
+        refresh = await sync_to_async(MyRefreshToken.for_user)(user)
         access_token = str(refresh.access_token)
 
-        response = JsonResponse({
-            "payloadType": "RegistrationResponseDto",
-            "payload": {"accessToken": access_token}
-        }, status=status.HTTP_201_CREATED)
-
-        response.set_cookie(
-            key="refresh_token",
-            value=str(refresh),
-            httponly=True,
-            secure=False,
-            samesite="Strict",
-            max_age=24 * 3600
+        response = EnvelopeResponse(
+            "RegistrationResponseDto", {"accessToken": access_token}, status=status.HTTP_201_CREATED
         )
+        _set_refresh_cookie(response, refresh)
         return response
 
 
 class LogoutView(APIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        resp = JsonResponse({}, status=204)
+        resp = FastJsonResponse({}, status=204)
         resp.delete_cookie('refresh_token')
         return resp
 
 
 class UserProfileView(RetrieveUpdateAPIView):
     serializer_class = UserSerializer
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.request.user
+        # user_cache відстає до AUTH_USER_CACHE_TTL і скидається лише в цьому процесі:
+        # save() кешованого об'єкта повернув би застарілі password/is_active/email
+        user = User.objects.filter(pk=self.request.user.pk).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed('User is inactive.', code='user_inactive')
+        return user
 
     def perform_update(self, serializer):
         user = serializer.save()
         pwd = self.request.data.get('password')
         if pwd:
             user.set_password(pwd)
-            user.save()
+            user.save(update_fields=['password'])
+        user_cache.invalidate(user.id)
+
+
+class CollectionVersionMixin:
+    # Після успішного запису піднімає версію колекцій користувача, від якої залежать ETag списків
+    versioned_collections = ()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in permissions.SAFE_METHODS and status.is_success(response.status_code):
+            CollectionVersion.bump(request.user.id, *self.versioned_collections)
+        return response
 
 
-class PetListCreateView(APIView):
-    authentication_classes = [JWTAuthentication]
+class PetListCreateView(CollectionVersionMixin, APIView):
+    versioned_collections = ('pets',)
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
     parser_classes = [JSONParser, MultiPartParser, FormParser]  # ← сюди
 
-    def get(self, request):
-        pets = Pet.objects.filter(user=request.user)
-        serializer = PetSerializer(pets, many=True)
-        return JsonResponse({
-            "payloadType": "PetListDto",
-            "payload": serializer.data
-        }, status=status.HTTP_200_OK)
-
     def post(self, request):
         serializer = PetSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save(user=request.user)
-        return JsonResponse({
-            "payloadType": "PetDto",
-            "payload": serializer.data
-        }, status=status.HTTP_201_CREATED)
+        return EnvelopeResponse("PetDto", serializer.data, status=status.HTTP_201_CREATED)
 
 
-class PetDetailView(APIView):
-    authentication_classes = [JWTAuthentication]
+class PetDetailView(CollectionVersionMixin, APIView):
+    # видалення тварини каскадно видаляє її події та записи журналу
+    versioned_collections = ('pets', 'calendar', 'journal')
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
     parser_classes = [JSONParser, MultiPartParser, FormParser]  # ← сюди
 
@@ -173,55 +221,38 @@ class PetDetailView(APIView):
         serializer = PetSerializer(pet, data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return JsonResponse({
-            "payloadType": "PetDto",
-            "payload": serializer.data
-        })
+        return EnvelopeResponse("PetDto", serializer.data)
 
     def patch(self, request, pk):
         pet = get_object_or_404(Pet, pk=pk, user=request.user)
         serializer = PetSerializer(pet, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return JsonResponse({
-            "payloadType": "PetDto",
-            "payload": serializer.data
-        })
+        return EnvelopeResponse("PetDto", serializer.data)
 
     def delete(self, request, pk):
         pet = get_object_or_404(Pet, pk=pk, user=request.user)
         pet.delete()
-        return JsonResponse({}, status=status.HTTP_204_NO_CONTENT)
+        return FastJsonResponse({}, status=status.HTTP_204_NO_CONTENT)
 
 
-class CalendarEventListCreateView(APIView):
-    authentication_classes = [JWTAuthentication]
+class CalendarEventListCreateView(CollectionVersionMixin, APIView):
+    versioned_collections = ('calendar',)
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
     parser_classes = [JSONParser, MultiPartParser, FormParser]
 
-    def get(self, request):
-        year = int(request.query_params.get('year', timezone.now().year))
-        month = int(request.query_params.get('month', timezone.now().month))
-        pet_id = request.query_params.get('pet')
-        events = CalendarEvent.objects.filter(
-            pet__user=request.user,
-            start_date__year=year,
-            start_date__month=month,
-            **({'pet__id': pet_id} if pet_id else {})
-        )
-        serializer = CalendarEventSerializer(events, many=True)
-        return JsonResponse({'payloadType': 'CalendarListDto', 'payload': serializer.data})
-
     def post(self, request):
         serializer = CalendarEventSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         pet = get_object_or_404(Pet, pk=request.data['pet'], user=request.user)
         serializer.save(pet=pet)
-        return JsonResponse({'payloadType': 'CalendarDto', 'payload': serializer.data}, status=201)
+        return EnvelopeResponse('CalendarDto', serializer.data, status=201)
 
 
-class CalendarEventDetailView(APIView):
-    authentication_classes = [JWTAuthentication]
+class CalendarEventDetailView(CollectionVersionMixin, APIView):
+    versioned_collections = ('calendar',)
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
     parser_classes = [JSONParser, MultiPartParser, FormParser]
 
@@ -230,30 +261,165 @@ class CalendarEventDetailView(APIView):
         serializer = CalendarEventSerializer(event, data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return JsonResponse({'payloadType': 'CalendarDto', 'payload': serializer.data})
+        return EnvelopeResponse('CalendarDto', serializer.data)
 
     def patch(self, request, pk):
         event = get_object_or_404(CalendarEvent, pk=pk, pet__user=request.user)
         serializer = CalendarEventSerializer(event, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return JsonResponse({'payloadType': 'CalendarDto', 'payload': serializer.data})
+        return EnvelopeResponse('CalendarDto', serializer.data)
 
     def delete(self, request, pk):
         event = get_object_or_404(CalendarEvent, pk=pk, pet__user=request.user)
         event.delete()
-        return JsonResponse({}, status=204)
+        return FastJsonResponse({}, status=204)
 
 
-class JournalEntryListCreateView(APIView):
-    authentication_classes = [JWTAuthentication]
+class CalendarEventBulkView(CollectionVersionMixin, APIView):
+    # [{"op": "create", "data": {...}}, {"op": "update", "id": 1, "data": {...}}, {"op": "delete", "id": 2}]
+    # Валідні операції застосовуються в одній транзакції, для кожної повертається свій результат
+    versioned_collections = ('calendar',)
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser]
+
+    def post(self, request):
+        operations = request.data
+        if not isinstance(operations, list) or not operations:
+            raise ValidationError({'detail': 'Expected a non-empty list of operations.'})
+        if len(operations) > settings.CALENDAR_BULK_MAX_OPERATIONS:
+            raise ValidationError({
+                'detail': f'At most {settings.CALENDAR_BULK_MAX_OPERATIONS} operations per request.'
+            })
+
+        # один запит на події і один на тварин - незалежно від розміру батчу
+        event_ids = [op.get('id') for op in operations if isinstance(op, dict) and isinstance(op.get('id'), int)]
+        events = CalendarEvent.objects.select_related('recurrence').in_bulk(event_ids) if event_ids else {}
+        pet_ids = {event.pet_id for event in events.values()}
+        for op in operations:
+            data = op.get('data') if isinstance(op, dict) else None
+            if isinstance(data, dict) and isinstance(data.get('pet'), int):
+                pet_ids.add(data['pet'])
+        owned_pets = set(Pet.objects.filter(user_id=request.user.id, id__in=pet_ids).values_list('id', flat=True))
+
+        results = [None] * len(operations)
+        to_create, to_update, to_delete, seen = [], [], [], set()
+        update_fields = set()
+        for index, op in enumerate(operations):
+            kind = op.get('op') if isinstance(op, dict) else None
+            if kind not in ('create', 'update', 'delete'):
+                results[index] = _bulk_error(index, kind, {'op': 'Must be create, update or delete.'})
+                continue
+            event = None
+            if kind != 'create':
+                event = events.get(op.get('id'))
+                if event is None or event.pet_id not in owned_pets:
+                    results[index] = _bulk_error(index, kind, {'id': 'Not found.'}, status.HTTP_404_NOT_FOUND)
+                    continue
+                if event.id in seen:
+                    results[index] = _bulk_error(index, kind, {'id': 'Event is already changed in this batch.'})
+                    continue
+                seen.add(event.id)
+            if kind == 'delete':
+                to_delete.append((index, event))
+                continue
+
+            serializer = CalendarEventBulkItemSerializer(event, data=op.get('data'), partial=kind == 'update')
+            if not serializer.is_valid():
+                results[index] = _bulk_error(index, kind, serializer.errors)
+                continue
+            values = serializer.validated_data
+            if 'pet_id' in values and values['pet_id'] not in owned_pets:
+                results[index] = _bulk_error(index, kind, {'pet': 'Not found.'}, status.HTTP_404_NOT_FOUND)
+                continue
+            if kind == 'create':
+                to_create.append((index, CalendarEvent(**values)))
+            else:
+                for field, value in values.items():
+                    setattr(event, field, value)
+                update_fields.update(values)
+                to_update.append((index, event))
+
+        with transaction.atomic():
+            CalendarEvent.objects.bulk_create([event for _, event in to_create])
+            for _, event in to_create:
+                # нова подія ще без серії: payload не робить запит за recurrence
+                CalendarEvent.recurrence.related.set_cached_value(event, None)
+            if to_update:
+                CalendarEvent.objects.bulk_update(
+                    [event for _, event in to_update],
+                    ['pet' if field == 'pet_id' else field for field in update_fields]
+                )
+            if 'start_date' in update_fields:
+                # ends_on серії залежить від start_date
+                for _, event in to_update:
+                    if getattr(event, 'recurrence', None) is not None:
+                        event.recurrence.save()
+            if to_delete:
+                CalendarEvent.objects.filter(id__in=[event.id for _, event in to_delete]).delete()
+            changed = [event.id for _, event in to_create + to_update]
+            if changed:
+                transaction.on_commit(lambda: schedule_reminders(changed), robust=True)
+
+        for code, items in ((status.HTTP_201_CREATED, to_create), (status.HTTP_200_OK, to_update)):
+            for index, event in items:
+                results[index] = {
+                    'index': index, 'op': operations[index]['op'], 'status': code,
+                    'payload': CalendarEventBulkItemSerializer(event).data
+                }
+        for index, event in to_delete:
+            results[index] = {'index': index, 'op': 'delete', 'status': status.HTTP_204_NO_CONTENT, 'id': event.id}
+        return EnvelopeResponse('CalendarBulkResultDto', results)
+
+
+def _bulk_error(index, op, errors, code=status.HTTP_400_BAD_REQUEST):
+    return {'index': index, 'op': op, 'status': code, 'errors': errors}
+
+
+class CalendarOccurrenceView(CollectionVersionMixin, APIView):
+    # Окреме повторення серії: PATCH зберігає стан (override), DELETE додає дату у виключення
+    versioned_collections = ('calendar',)
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
     parser_classes = [JSONParser, MultiPartParser, FormParser]
 
-    def get(self, request):
-        entries = JournalEntry.objects.filter(pet__user=request.user).order_by('-created_at')
-        serializer = JournalEntrySerializer(entries, many=True)
-        return JsonResponse({'payloadType': 'JournalListDto', 'payload': serializer.data})
+    def _get_occurrence(self, request, pk, occurrence_date):
+        try:
+            day = date.fromisoformat(occurrence_date)
+        except ValueError:
+            raise ValidationError({'occurrence_date': 'Use YYYY-MM-DD.'})
+        event = get_object_or_404(
+            CalendarEvent.objects.select_related('recurrence'), pk=pk, pet__user=request.user
+        )
+        recurrence = getattr(event, 'recurrence', None)
+        if recurrence is None or day not in recurrence.dates_between(day, day + timedelta(days=1)):
+            raise Http404
+        return event, day
+
+    def patch(self, request, pk, occurrence_date):
+        event, day = self._get_occurrence(request, pk, occurrence_date)
+        serializer = EventOccurrenceOverrideSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        override, _ = EventOccurrenceOverride.objects.update_or_create(
+            event=event, occurrence_date=day, defaults=serializer.validated_data
+        )
+        return EnvelopeResponse('CalendarOccurrenceDto', EventOccurrenceOverrideSerializer(override).data)
+
+    def delete(self, request, pk, occurrence_date):
+        event, day = self._get_occurrence(request, pk, occurrence_date)
+        with transaction.atomic():
+            event.recurrence.exdates = sorted({*event.recurrence.exdates, day.isoformat()})
+            event.recurrence.save()
+            EventOccurrenceOverride.objects.filter(event=event, occurrence_date=day).delete()
+        return FastJsonResponse({}, status=status.HTTP_204_NO_CONTENT)
+
+
+class JournalEntryListCreateView(CollectionVersionMixin, APIView):
+    versioned_collections = ('journal',)
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
 
     def post(self, request):
         serializer = JournalEntrySerializer(data=request.data)
@@ -262,12 +428,12 @@ class JournalEntryListCreateView(APIView):
         pet = get_object_or_404(Pet, pk=request.data.get('pet'), user=request.user)
         serializer.save(pet=pet)
 
-        return JsonResponse({'payloadType': 'JournalDto', 'payload': serializer.data},
-                            status=status.HTTP_201_CREATED)
+        return EnvelopeResponse('JournalDto', serializer.data, status=status.HTTP_201_CREATED)
 
 
-class JournalEntryDetailView(APIView):
-    authentication_classes = [JWTAuthentication]
+class JournalEntryDetailView(CollectionVersionMixin, APIView):
+    versioned_collections = ('journal',)
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
     parser_classes = [JSONParser, MultiPartParser, FormParser]
 
@@ -276,100 +442,69 @@ class JournalEntryDetailView(APIView):
         serializer = JournalEntrySerializer(entry, data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return JsonResponse({'payloadType': 'JournalDto', 'payload': serializer.data})
+        return EnvelopeResponse('JournalDto', serializer.data)
 
     def patch(self, request, pk):
         entry = get_object_or_404(JournalEntry, pk=pk, pet__user=request.user)
         serializer = JournalEntrySerializer(entry, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return JsonResponse({'payloadType': 'JournalDto', 'payload': serializer.data})
+        return EnvelopeResponse('JournalDto', serializer.data)
 
     def delete(self, request, pk):
         entry = get_object_or_404(JournalEntry, pk=pk, pet__user=request.user)
         entry.delete()
-        return JsonResponse({}, status=status.HTTP_204_NO_CONTENT)
-
-
-class SitePartnerListView(generics.ListAPIView):
-    queryset = SitePartner.objects.all()
-    serializer_class = SitePartnerSerializer
-    permission_classes = [permissions.IsAuthenticated]
+        return FastJsonResponse({}, status=status.HTTP_204_NO_CONTENT)
 
 
 class ForumPostView(APIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
-    def get(self, request):
-        posts = ForumPost.objects.all().order_by('-created_at')
-        serializer = ForumPostSerializer(
-            posts, many=True, context={'request': request}
-        )
-        return JsonResponse(serializer.data, safe=False)
-
     def post(self, request):
         serializer = ForumPostSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         serializer.save(user=request.user)
-        return JsonResponse(serializer.data, status=status.HTTP_201_CREATED)
+        return FastJsonResponse(serializer.data, status=status.HTTP_201_CREATED)
 
     def delete(self, request, post_id):
         post = get_object_or_404(ForumPost, pk=post_id)
         if post.user != request.user:
-            return JsonResponse({'detail': 'Нема прав'}, status=403)
+            return FastJsonResponse({'detail': 'Нема прав'}, status=403)
         post.delete()
-        return JsonResponse({}, status=204)
+        return FastJsonResponse({}, status=204)
 
 
 class ForumCommentView(APIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
-    def get(self, request, post_id):
-        comments = ForumComment.objects.filter(forum_post_id=post_id).order_by('created_at')
-        serializer = ForumCommentSerializer(comments, many=True)
-        return JsonResponse(serializer.data, safe=False)
-
     def post(self, request, post_id):
         post = get_object_or_404(ForumPost, pk=post_id)
         serializer = ForumCommentSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(user=request.user, forum_post=post)
-        return JsonResponse(serializer.data, status=status.HTTP_201_CREATED)
+        with transaction.atomic():
+            serializer.save(user=request.user, forum_post=post)
+            ForumPost.objects.filter(pk=post.pk).update(comments_count=F('comments_count') + 1)
+        return FastJsonResponse(serializer.data, status=status.HTTP_201_CREATED)
 
 
 class ForumLikeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, post_id):
-        post = get_object_or_404(ForumPost, pk=post_id)
-        like, created = ForumLike.objects.get_or_create(user=request.user, forum_post=post)
-        if not created:
-            like.delete()
-            liked = False
-        else:
-            liked = True
-        return JsonResponse({
+        try:
+            with transaction.atomic():
+                liked, likes_count = ForumLike.toggle(request.user.id, post_id)
+        except ForumPost.DoesNotExist:
+            raise Http404
+        return FastJsonResponse({
             'liked': liked,
-            'likes_count': post.likes.count()
+            'likes_count': likes_count
         })
 
 
-class PartnerWatchlistListView(APIView):
-    authentication_classes = [JWTAuthentication]
-    permission_classes = [permissions.IsAuthenticated]
-    parser_classes = [JSONParser, MultiPartParser, FormParser]
-
-    def get(self, request):
-        partner_ids = request.user.partner_watchlist.values_list('partner__id', flat=True)
-        return JsonResponse({
-            "payloadType": "PartnerWatchlistListDto",
-            "payload": list(partner_ids)
-        }, status=status.HTTP_200_OK)
-
-
 class PartnerWatchlistDetailView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [JSONParser, MultiPartParser, FormParser]
 
@@ -378,10 +513,7 @@ class PartnerWatchlistDetailView(APIView):
         PartnerWatchlist.objects.get_or_create(
             user=request.user, partner=partner
         )
-        return JsonResponse({
-            "payloadType": "PartnerWatchlistDto",
-            "payload": {"partner_id": partner_id}
-        }, status=status.HTTP_201_CREATED)
+        return EnvelopeResponse("PartnerWatchlistDto", {"partner_id": partner_id}, status=status.HTTP_201_CREATED)
 
     def delete(self, request, partner_id):
         entry = get_object_or_404(
@@ -390,4 +522,12 @@ class PartnerWatchlistDetailView(APIView):
             partner__id=partner_id
         )
         entry.delete()
-        return JsonResponse({}, status=status.HTTP_204_NO_CONTENT)
+        return FastJsonResponse({}, status=status.HTTP_204_NO_CONTENT)
+
+
+class DatabasePoolStatsView(APIView):
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return EnvelopeResponse('DatabasePoolStatsDto', pool_stats())
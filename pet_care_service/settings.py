@@ -53,6 +53,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'pet_care_app',
     'rest_framework',
     'corsheaders',
@@ -68,13 +69,42 @@ AWS_STORAGE_BUCKET_NAME = 'diploma-nedashkivska'
 AWS_S3_REGION_NAME = 'eu-central-1'
 AWS_S3_CUSTOM_DOMAIN = f'{AWS_STORAGE_BUCKET_NAME}.s3-accelerate.amazonaws.com'
 
+AWS_S3_MAX_POOL_CONNECTIONS = int(os.getenv('AWS_S3_MAX_POOL_CONNECTIONS', 50))
+AWS_S3_MULTIPART_THRESHOLD = int(os.getenv('AWS_S3_MULTIPART_THRESHOLD', 8 * 1024 * 1024))
+AWS_S3_MULTIPART_CHUNKSIZE = int(os.getenv('AWS_S3_MULTIPART_CHUNKSIZE', 8 * 1024 * 1024))
+AWS_S3_MAX_CONCURRENCY = int(os.getenv('AWS_S3_MAX_CONCURRENCY', 4))
+
 # Store media files in S3
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 
+# Backend for uploaded photos: S3MediaStorage or LocalMediaStorage (tests, benchmarks)
+MEDIA_STORAGE_BACKEND = os.getenv('MEDIA_STORAGE_BACKEND', 'pet_care_app.media_storage.S3MediaStorage')
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Photo uploads run in a bounded background pool; 0 workers = upload inline after commit.
+# When the queue is full the photo is marked FAILED instead of being uploaded on the request thread
+MEDIA_UPLOAD_WORKERS = int(os.getenv('MEDIA_UPLOAD_WORKERS', 4))
+MEDIA_UPLOAD_QUEUE_SIZE = int(os.getenv('MEDIA_UPLOAD_QUEUE_SIZE', 64))
+MEDIA_UPLOAD_MAX_ATTEMPTS = int(os.getenv('MEDIA_UPLOAD_MAX_ATTEMPTS', 3))
+MEDIA_UPLOAD_RETRY_BACKOFF = float(os.getenv('MEDIA_UPLOAD_RETRY_BACKOFF', 0.5))
+MEDIA_UPLOAD_SPOOL_MAX_MEMORY = int(os.getenv('MEDIA_UPLOAD_SPOOL_MAX_MEMORY', 2 * 1024 * 1024))
+# Photos still PENDING after this long are failed by `manage.py expire_photo_uploads`
+MEDIA_UPLOAD_STALE_MINUTES = int(os.getenv('MEDIA_UPLOAD_STALE_MINUTES', 30))
+
+# Uploaded photos are re-encoded into these variants (longest side, px); photo_url is the largest
+MEDIA_PHOTO_VARIANTS = {
+    'full': int(os.getenv('MEDIA_PHOTO_FULL_SIZE', 2048)),
+    'medium': int(os.getenv('MEDIA_PHOTO_MEDIUM_SIZE', 1024)),
+    'thumbnail': int(os.getenv('MEDIA_PHOTO_THUMBNAIL_SIZE', 320)),
+}
+MEDIA_PHOTO_FORMAT = os.getenv('MEDIA_PHOTO_FORMAT', 'WEBP')
+MEDIA_PHOTO_QUALITY = int(os.getenv('MEDIA_PHOTO_QUALITY', 82))
+
 # Optional — the URL through which the files will be accessible
-MEDIA_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/'
+MEDIA_URL = os.getenv('MEDIA_URL', f'https://{AWS_S3_CUSTOM_DOMAIN}/')
 
 MIDDLEWARE = [
+    'pet_care_app.profiling.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -84,22 +114,94 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'pet_care_app.db_pool.PoolTimeoutMiddleware',
 ]
 
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'pet_care_app.responses.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     "DEFAULT_PERMISSION_CLASSES": [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication'
+        'pet_care_app.authentication.ClaimsJWTAuthentication'
     ],
 }
 
+# Shared cache (e.g. django.core.cache.backends.redis.RedisCache) keeps invalidation consistent across workers;
+# with the default per-process LocMemCache other workers see changes after the TTL
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+PARTNER_CATALOG_CACHE_TTL = int(os.getenv('PARTNER_CATALOG_CACHE_TTL', 300))
+
+# Upper bound for recurrence COUNT; open-ended series use until or no end
+CALENDAR_RECURRENCE_MAX_COUNT = int(os.getenv('CALENDAR_RECURRENCE_MAX_COUNT', 1000))
+CALENDAR_RECURRENCE_MAX_INTERVAL = int(os.getenv('CALENDAR_RECURRENCE_MAX_INTERVAL', 1000))
+
+CALENDAR_BULK_MAX_OPERATIONS = int(os.getenv('CALENDAR_BULK_MAX_OPERATIONS', 200))
+
+# Per-request SQL/serialization/storage timings: Server-Timing header and a JSON log line on pet_care_app.perf
+PERF_INSTRUMENTATION = os.getenv('PERF_INSTRUMENTATION', 'true').lower() == 'true'
+# Off by default: the header exposes DB time and query counts to every client
+PERF_SERVER_TIMING = os.getenv('PERF_SERVER_TIMING', 'false').lower() == 'true'
+# Identical SQL shapes repeated this many times in one request are reported as N+1
+PERF_N_PLUS_ONE_THRESHOLD = int(os.getenv('PERF_N_PLUS_ONE_THRESHOLD', 5))
+# Raise QueryBudgetExceeded instead of logging when a view exceeds its query_budget (for tests/CI)
+PERF_STRICT_QUERY_BUDGET = os.getenv('PERF_STRICT_QUERY_BUDGET', 'false').lower() == 'true'
+
+# Reminders are sent by `manage.py send_reminders` workers; the notifier is any class with send_many(reminders)
+CALENDAR_REMINDER_NOTIFIER = os.getenv('CALENDAR_REMINDER_NOTIFIER', 'pet_care_app.reminders.EmailReminderNotifier')
+CALENDAR_REMINDER_LEAD_MINUTES = int(os.getenv('CALENDAR_REMINDER_LEAD_MINUTES', 24 * 60))
+# Time of day assumed for events without start_time
+CALENDAR_REMINDER_DEFAULT_TIME = os.getenv('CALENDAR_REMINDER_DEFAULT_TIME', '09:00')
+CALENDAR_REMINDER_BATCH_SIZE = int(os.getenv('CALENDAR_REMINDER_BATCH_SIZE', 200))
+CALENDAR_REMINDER_MAX_ATTEMPTS = int(os.getenv('CALENDAR_REMINDER_MAX_ATTEMPTS', 5))
+# How long a worker owns a claimed batch; must exceed the time to send one batch
+CALENDAR_REMINDER_LEASE_SECONDS = int(os.getenv('CALENDAR_REMINDER_LEASE_SECONDS', 600))
+
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'false').lower() == 'true'
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@localhost')
+
+# Per-process cache of authenticated users for endpoints that need the full User model
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', 1024))
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', 60))
+
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
     'django.contrib.auth.hashers.PBKDF2PasswordHasher',
 ]
 
+# Sign-in/sign-up hash passwords in a dedicated pool; requests beyond the queue limit get 503
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', os.cpu_count() or 2))
+PASSWORD_HASHING_QUEUE_LIMIT = int(os.getenv('PASSWORD_HASHING_QUEUE_LIMIT', 32))
+
+FORUM_FEED_PAGE_SIZE = int(os.getenv('FORUM_FEED_PAGE_SIZE', 20))
+FORUM_FEED_MAX_PAGE_SIZE = int(os.getenv('FORUM_FEED_MAX_PAGE_SIZE', 100))
+FORUM_FEED_COMMENT_PREVIEW = int(os.getenv('FORUM_FEED_COMMENT_PREVIEW', 3))
+FORUM_COMMENTS_PAGE_SIZE = int(os.getenv('FORUM_COMMENTS_PAGE_SIZE', 50))
+FORUM_COMMENTS_MAX_PAGE_SIZE = int(os.getenv('FORUM_COMMENTS_MAX_PAGE_SIZE', 200))
+FORUM_SEARCH_PAGE_SIZE = int(os.getenv('FORUM_SEARCH_PAGE_SIZE', 20))
+FORUM_SEARCH_MAX_PAGE_SIZE = int(os.getenv('FORUM_SEARCH_MAX_PAGE_SIZE', 50))
+FORUM_SEARCH_MIN_QUERY = int(os.getenv('FORUM_SEARCH_MIN_QUERY', 3))
+JOURNAL_PAGE_SIZE = int(os.getenv('JOURNAL_PAGE_SIZE', 50))
+JOURNAL_MAX_PAGE_SIZE = int(os.getenv('JOURNAL_MAX_PAGE_SIZE', 200))
+TIMELINE_PAGE_SIZE = int(os.getenv('TIMELINE_PAGE_SIZE', 50))
+TIMELINE_MAX_PAGE_SIZE = int(os.getenv('TIMELINE_MAX_PAGE_SIZE', 200))
+# Rows per server-side cursor fetch when exporting history
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=2),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -137,9 +239,30 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('DATABASE_HOST'),
         'PORT': os.getenv('DATABASE_PORT'),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# psycopg 3 connection pool (PostgreSQL only); CONN_HEALTH_CHECKS also checks pooled connections.
+# Without the pool, connections are closed after each request by default: the app runs under ASGI,
+# where every request runs in its own thread and persistent connections (CONN_MAX_AGE > 0) pile up.
+# A non-zero DATABASE_CONN_MAX_AGE only makes sense for a WSGI deployment
+DATABASE_POOL = os.getenv('DATABASE_POOL', 'true').lower() == 'true'
+
+if 'postgresql' in (DATABASES['default']['ENGINE'] or '') and DATABASE_POOL:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', 10)),
+            'timeout': float(os.getenv('DATABASE_POOL_TIMEOUT', 5)),
+            'max_idle': float(os.getenv('DATABASE_POOL_MAX_IDLE', 300)),
+            'max_lifetime': float(os.getenv('DATABASE_POOL_MAX_LIFETIME', 3600)),
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DATABASE_CONN_MAX_AGE', 0))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 